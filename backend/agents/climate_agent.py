@@ -4,11 +4,22 @@ Fetches real-time weather data from Open-Meteo API (free, no key required)
 and computes plant disease outbreak probability.
 """
 
-import httpx
+import asyncio
+import numpy as np
 from datetime import datetime
-
-
-OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+from agents.numeric import round_like_python
+from cache import SWRCache
+from config import (
+    OPEN_METEO_URL,
+    CLIMATE_GRID_RES,
+    CLIMATE_CACHE_TTL,
+    CLIMATE_CACHE_STALE_TTL,
+    CLIMATE_CACHE_SIZE,
+    HEATMAP_BATCH_SIZE,
+    HEATMAP_MAX_CELLS,
+    HEATMAP_CONCURRENCY,
+)
+from http_clients import get_client
 
 
 def _compute_outbreak_probability(
@@ -68,6 +79,43 @@ def _compute_outbreak_probability(
     return min(round(score, 1), 100.0)
 
 
+def _compute_outbreak_probability_vec(
+    temperature: np.ndarray,
+    humidity: np.ndarray,
+    rainfall: np.ndarray,
+    wind_speed: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorised _compute_outbreak_probability: scores whole arrays (every hour
+    of a forecast, every cell of a grid) in one pass, with results identical
+    to the scalar version element by element.
+    """
+    t = np.asarray(temperature, dtype=np.float64)
+    h = np.asarray(humidity, dtype=np.float64)
+    r = np.asarray(rainfall, dtype=np.float64)
+    w = np.asarray(wind_speed, dtype=np.float64)
+
+    score = np.zeros(np.broadcast(t, h, r, w).shape, dtype=np.float64)
+
+    # Temperature factor (40% weight) — peak at 22-26°C
+    score += np.select(
+        [(t >= 18) & (t <= 28), ((t >= 10) & (t < 18)) | ((t > 28) & (t <= 35))],
+        [(1.0 - np.abs(t - 24) / 10) * 40, 10.0],
+        0.0,
+    )
+
+    # Humidity factor (30% weight)
+    score += np.select([h >= 90, h >= 80, h >= 70, h >= 60], [30.0, 25.0, 15.0, 8.0], 0.0)
+
+    # Rainfall factor (20% weight)
+    score += np.select([r > 20, r > 10, r > 5, r > 0], [20.0, 15.0, 10.0, 5.0], 0.0)
+
+    # Wind factor (10% weight)
+    score += np.select([w < 5, w < 10, w < 20], [10.0, 7.0, 3.0], 0.0)
+
+    return np.minimum(round_like_python(score, 1), 100.0)
+
+
 def _classify_risk(probability: float) -> str:
     if probability >= 70:
         return "High"
@@ -77,6 +125,11 @@ def _classify_risk(probability: float) -> str:
         return "Low"
 
 
+def _classify_risk_vec(probability: np.ndarray) -> np.ndarray:
+    p = np.asarray(probability, dtype=np.float64)
+    return np.select([p >= 70, p >= 40], ["High", "Moderate"], "Low")
+
+
 def _generate_forecast_summary(
     temperature: float,
     humidity: float,
@@ -107,11 +160,13 @@ def _generate_forecast_summary(
     return f"Current weather shows {condition_str}, {urgency.get(risk_level, '')}"
 
 
-async def get_climate_risk(lat: float, lon: float) -> dict:
-    """
-    Fetch real-time weather data for given coordinates and compute
-    plant disease outbreak risk.
-    """
+def climate_cell(lat: float, lon: float) -> tuple[float, float]:
+    """Snap coordinates to the centre of their CLIMATE_GRID_RES° grid cell."""
+    res = CLIMATE_GRID_RES
+    return (round(round(lat / res) * res, 4), round(round(lon / res) * res, 4))
+
+
+async def _fetch_current_weather(lat: float, lon: float) -> dict:
     params = {
         "latitude": lat,
         "longitude": lon,
@@ -126,16 +181,32 @@ async def get_climate_risk(lat: float, lon: float) -> dict:
         "forecast_days": 1,
     }
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        response = await client.get(OPEN_METEO_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
+    response = await get_client("open_meteo").get(OPEN_METEO_URL, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+CURRENT_VARIABLES = ["temperature_2m", "relative_humidity_2m", "precipitation", "wind_speed_10m"]
+
+
+def _current_complete(data: dict) -> bool:
+    """Open-Meteo reports null for variables a location has no reading for."""
+    current = data.get("current") or {}
+    return all(current.get(name) is not None for name in CURRENT_VARIABLES)
 
-    current = data.get("current", {})
-    temperature = current.get("temperature_2m", 0)
-    humidity = current.get("relative_humidity_2m", 0)
-    wind_speed = current.get("wind_speed_10m", 0)
-    rainfall = current.get("precipitation", 0)
+
+def _score_weather(data: dict) -> dict:
+    """Compute the climate risk result from an Open-Meteo `current` response."""
+    current = data.get("current") or {}
+
+    def value(name: str) -> float:
+        reading = current.get(name)
+        return 0 if reading is None else reading
+
+    temperature = value("temperature_2m")
+    humidity = value("relative_humidity_2m")
+    wind_speed = value("wind_speed_10m")
+    rainfall = value("precipitation")
 
     outbreak_prob = _compute_outbreak_probability(
         temperature, humidity, rainfall, wind_speed
@@ -154,3 +225,252 @@ async def get_climate_risk(lat: float, lon: float) -> dict:
         ),
         "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
     }
+
+
+async def _fetch_cell(cell: tuple[float, float]) -> dict:
+    data = await _fetch_current_weather(*cell)
+    return {"raw": data, "result": _score_weather(data)}
+
+
+# Weather per grid cell: raw Open-Meteo response + computed risk result
+_climate_cache = SWRCache(
+    ttl=CLIMATE_CACHE_TTL,
+    stale_ttl=CLIMATE_CACHE_STALE_TTL,
+    maxsize=CLIMATE_CACHE_SIZE,
+    name="climate_cells",
+)
+
+
+def get_climate_cache() -> SWRCache:
+    return _climate_cache
+
+
+async def refresh_climate_cell(lat: float, lon: float) -> dict:
+    """Force a fetch for the cell containing (lat, lon) and store it."""
+    cell = climate_cell(lat, lon)
+    entry = await _climate_cache.refresh(cell, lambda: _fetch_cell(cell))
+    return dict(entry["result"])
+
+
+async def get_climate_risk(lat: float, lon: float) -> dict:
+    """
+    Fetch real-time weather data for given coordinates and compute
+    plant disease outbreak risk.
+    Results are cached per grid cell; a burst of requests for one cell
+    triggers a single upstream fetch.
+    """
+    cell = climate_cell(lat, lon)
+    entry = await _climate_cache.get_or_fetch(cell, lambda: _fetch_cell(cell))
+    return dict(entry["result"])
+
+
+# ── Multi-day outbreak risk curve ──
+
+HOURLY_VARIABLES = ["temperature_2m", "relative_humidity_2m", "precipitation", "wind_speed_10m"]
+
+
+async def _fetch_hourly_forecast(cell: tuple[float, float], days: int) -> dict:
+    params = {
+        "latitude": cell[0],
+        "longitude": cell[1],
+        "hourly": HOURLY_VARIABLES,
+        "timezone": "auto",
+        "forecast_days": days,
+    }
+
+    response = await get_client("open_meteo").get(OPEN_METEO_URL, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+def _hourly_arrays(hourly: dict) -> list[np.ndarray]:
+    """Open-Meteo hourly lists → float arrays, missing values scored as 0 like the scalar path."""
+    return [
+        np.nan_to_num(np.array(hourly.get(name, []), dtype=np.float64), nan=0.0)
+        for name in HOURLY_VARIABLES
+    ]
+
+
+def _score_forecast(data: dict) -> dict:
+    """Score every forecast hour in one array pass and summarise per day."""
+    hourly = data.get("hourly", {})
+    times = hourly.get("time", [])
+    temperature, humidity, rainfall, wind_speed = _hourly_arrays(hourly)
+
+    probability = _compute_outbreak_probability_vec(temperature, humidity, rainfall, wind_speed)
+    risk_level = _classify_risk_vec(probability)
+
+    # Daily summary: ISO timestamps share the date prefix
+    dates = np.array([t[:10] for t in times])
+    day_keys, day_index = np.unique(dates, return_inverse=True)
+    day_max = np.full(len(day_keys), -np.inf)
+    np.maximum.at(day_max, day_index, probability)
+    day_mean = np.bincount(day_index, weights=probability) / np.bincount(day_index)
+    high_hours = np.bincount(day_index, weights=(risk_level == "High"))
+
+    daily = [
+        {
+            "date": day,
+            "peak_probability": float(peak),
+            "mean_probability": round(float(mean), 1),
+            "risk_level": _classify_risk(float(peak)),
+            "high_risk_hours": int(hours),
+        }
+        for day, peak, mean, hours in zip(day_keys.tolist(), day_max, day_mean, high_hours)
+    ]
+
+    return {
+        "hourly": {
+            "time": times,
+            "outbreak_probability": probability.tolist(),
+            "risk_level": risk_level.tolist(),
+        },
+        "daily": daily,
+        "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
+    }
+
+
+async def _fetch_curve(cell: tuple[float, float], days: int) -> dict:
+    return _score_forecast(await _fetch_hourly_forecast(cell, days))
+
+
+_forecast_cache = SWRCache(
+    ttl=CLIMATE_CACHE_TTL,
+    stale_ttl=CLIMATE_CACHE_STALE_TTL,
+    maxsize=CLIMATE_CACHE_SIZE,
+    name="climate_forecast",
+)
+
+
+def get_forecast_cache() -> SWRCache:
+    return _forecast_cache
+
+
+async def get_outbreak_curve(lat: float, lon: float, days: int = 7) -> dict:
+    """
+    Hourly outbreak probability over the next `days` days for (lat, lon),
+    with a per-day peak/mean summary. Cached per grid cell and horizon.
+    """
+    cell = climate_cell(lat, lon)
+    result = await _forecast_cache.get_or_fetch((cell, days), lambda: _fetch_curve(cell, days))
+    return {"latitude": cell[0], "longitude": cell[1], "days": days, **result}
+
+
+# ── Region risk heatmap ──
+
+async def _fetch_current_weather_batch(cells: list[tuple[float, float]]) -> list[dict]:
+    """One Open-Meteo call for many locations (comma-separated coordinates)."""
+    params = {
+        "latitude": ",".join(str(lat) for lat, _ in cells),
+        "longitude": ",".join(str(lon) for _, lon in cells),
+        "current": [
+            "temperature_2m",
+            "relative_humidity_2m",
+            "wind_speed_10m",
+            "precipitation",
+        ],
+        "daily": ["precipitation_sum"],
+        "timezone": "auto",
+        "forecast_days": 1,
+    }
+
+    response = await get_client("open_meteo").get(OPEN_METEO_URL, params=params)
+    response.raise_for_status()
+    data = response.json()
+    # A single location comes back as an object, several as a list
+    return data if isinstance(data, list) else [data]
+
+
+def _grid_axis(start: float, stop: float, step: float) -> list[float]:
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return [round(start + i * step, 4) for i in range(max(count, 1))]
+
+
+async def get_risk_heatmap(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    resolution: float,
+) -> dict:
+    """
+    Outbreak probability for every cell of a lat/lon grid over a bounding box.
+
+    Cells are snapped to the climate cache grid, so fresh cells (from earlier
+    point lookups, prefetch or heatmaps) are reused; the rest are fetched in
+    batches of HEATMAP_BATCH_SIZE locations per Open-Meteo call, at most
+    HEATMAP_CONCURRENCY at a time, and stored back per cell. Scoring runs over
+    all cells in one array pass; cells whose batch failed or whose readings
+    came back null are reported as null.
+    """
+    # Whole multiples of the cache grid keep cells aligned with cached entries
+    step = max(1, round(resolution / CLIMATE_GRID_RES)) * CLIMATE_GRID_RES
+    south_c, west_c = climate_cell(south, west)
+    north_c, east_c = climate_cell(north, east)
+    lats = _grid_axis(south_c, north_c, step)
+    lons = _grid_axis(west_c, east_c, step)
+
+    if len(lats) * len(lons) > HEATMAP_MAX_CELLS:
+        raise ValueError(
+            f"Grid of {len(lats)}x{len(lons)} cells exceeds HEATMAP_MAX_CELLS={HEATMAP_MAX_CELLS}; "
+            f"use a coarser resolution or a smaller box"
+        )
+
+    cells = [climate_cell(lat, lon) for lat in lats for lon in lons]
+
+    raw: dict[tuple[float, float], dict] = {}
+    missing = []
+    for cell in dict.fromkeys(cells):
+        entry = _climate_cache.peek(cell)
+        if entry is not None and entry[1] < CLIMATE_CACHE_TTL:
+            raw[cell] = entry[0]["raw"]
+        else:
+            missing.append(cell)
+
+    batches = [missing[i:i + HEATMAP_BATCH_SIZE] for i in range(0, len(missing), HEATMAP_BATCH_SIZE)]
+    semaphore = asyncio.Semaphore(max(1, HEATMAP_CONCURRENCY))
+
+    async def fetch(batch: list[tuple[float, float]]) -> list[dict]:
+        async with semaphore:
+            return await _fetch_current_weather_batch(batch)
+
+    # A failed batch or a cell with null readings leaves a gap, not a failed heatmap
+    responses = await asyncio.gather(*(fetch(b) for b in batches), return_exceptions=True)
+    failures = [r for r in responses if isinstance(r, BaseException)]
+    if batches and len(failures) == len(batches) and not raw:
+        raise failures[0]
+    for batch, results in zip(batches, responses):
+        if isinstance(results, BaseException):
+            print(f"Heatmap batch of {len(batch)} cells failed: {results}")
+            continue
+        for cell, data in zip(batch, results):
+            if _current_complete(data):
+                _climate_cache.set(cell, {"raw": data, "result": _score_weather(data)})
+                raw[cell] = data
+
+    def column(name: str) -> np.ndarray:
+        readings = ((raw.get(c) or {}).get("current") or {} for c in cells)
+        return np.array(
+            [np.nan if r.get(name) is None else r[name] for r in readings], dtype=np.float64
+        )
+
+    columns = [column(name) for name in CURRENT_VARIABLES]
+    probability = _compute_outbreak_probability_vec(*columns)
+    probability[np.isnan(np.stack(columns)).any(axis=0)] = np.nan
+    probability = probability.reshape(len(lats), len(lons))
+
+    return {
+        "bbox": [south, west, north, east],
+        "resolution": round(step, 4),
+        "lats": lats,
+        "lons": lons,
+        # rows follow lats, columns follow lons; null where the cell has no data
+        "outbreak_probability": [
+            [None if np.isnan(p) else float(p) for p in row] for row in probability
+        ],
+        "cells": len(cells),
+        "cells_fetched": len(missing),
+        "cells_missing": int(np.isnan(probability).sum()),
+        "upstream_calls": len(batches),
+        "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
+    }
@@ -0,0 +1,24 @@
+"""
+Small NumPy helpers shared by the vectorised agent scorers.
+"""
+import numpy as np
+
+
+def round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Element-wise equivalent of Python's round(x, ndigits).
+
+    np.round scales by 10**ndigits before rounding, which can flip results
+    that sit within an ulp of a .5 tie; those rare elements are re-rounded
+    with the builtin so vectorised scores match the scalar ones exactly.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        flat = rounded.reshape(-1)
+        src = values.reshape(-1)
+        flat[idx] = [round(float(src[i]), ndigits) for i in idx]
+    return rounded
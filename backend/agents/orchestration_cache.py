@@ -0,0 +1,133 @@
+"""
+Orchestration Response Cache
+Caches LLM orchestration results under a canonical, bucketed view of the
+agent inputs instead of the raw prompt — the prompt carries `last_updated`
+stamps and the current time, so it is unique on every call even when the
+signals are identical. Farmers in the same region and commodity with the
+same risk level, NDVI bucket, trend and disease label share one completion
+per TTL window.
+
+Tier 1: in-memory LRU with TTL. Tier 2 (optional): SQLite file next to jomee.db.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import math
+
+from cache import TTLCache, SqliteCache
+
+_PROBABILITY_BUCKET = 10     # outbreak probability, %
+_NDVI_BUCKET = 0.05
+_CONFIDENCE_BUCKET = 10      # vision confidence, %
+
+
+def _bucket(value, size: float):
+    try:
+        return round(math.floor(float(value) / size) * size, 4)
+    except (TypeError, ValueError):
+        return None
+
+
+def _failed(data) -> bool:
+    return not data or data.get("status") == "error"
+
+
+def canonical_inputs(
+    region: str,
+    commodity: str,
+    climate: dict,
+    satellite: dict,
+    market: dict,
+    vision: dict | None,
+) -> dict:
+    """The subset of agent output that drives the assessment, bucketed."""
+    view = {"region": region, "commodity": commodity}
+
+    view["climate"] = None if _failed(climate) else {
+        "risk_level":  climate.get("risk_level"),
+        "probability": _bucket(climate.get("outbreak_probability"), _PROBABILITY_BUCKET),
+    }
+    view["satellite"] = None if _failed(satellite) else {
+        "stress": satellite.get("vegetation_stress"),
+        "ndvi":   _bucket(satellite.get("ndvi_score"), _NDVI_BUCKET),
+        "trend":  satellite.get("health_trend"),
+    }
+
+    momentum = (market or {}).get("momentum") or {}
+    view["market"] = None if _failed(market) else {
+        "trend":        market.get("trend"),
+        "buyer_signal": market.get("buyer_signal"),
+        "momentum":     momentum.get("momentum") if isinstance(momentum, dict) else momentum,
+        "action":       (market.get("recommendation") or {}).get("action"),
+    }
+
+    view["vision"] = None if not vision else {
+        "disease":    vision.get("disease_name"),
+        "confidence": _bucket(vision.get("confidence"), _CONFIDENCE_BUCKET),
+    }
+    return view
+
+
+def semantic_key(view: dict, model: str) -> str:
+    payload = json.dumps(view, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+    return f"{digest}|{model}"
+
+
+class OrchestrationCache:
+    def __init__(
+        self,
+        maxsize: int = 512,
+        ttl: float = 1800.0,
+        disk_path: str | None = None,
+    ):
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl, name="orchestration")
+        self.disk = SqliteCache(disk_path, table="orchestration", ttl=ttl) if disk_path else None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.shared = 0
+
+    async def get(self, key: str) -> dict | None:
+        hit = self.memory.get(key)
+        if hit is None and self.disk is not None:
+            hit = await asyncio.to_thread(self.disk.get, key)
+            if hit is not None:
+                self.memory.set(key, hit)
+        return copy.deepcopy(hit) if hit is not None else None
+
+    async def set(self, key: str, result: dict) -> None:
+        self.memory.set(key, copy.deepcopy(result))
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, result)
+
+    async def get_or_create(self, key: str, create) -> tuple[dict, bool]:
+        """
+        Return (result, cached). Concurrent misses for one key share a single
+        `create()` call, so a burst of identical requests costs one completion.
+        """
+        hit = await self.get(key)
+        if hit is not None:
+            return hit, True
+
+        task = self._inflight.get(key)
+        if task is None:
+            async def _run():
+                result = await create()
+                await self.set(key, result)
+                return result
+
+            task = asyncio.get_running_loop().create_task(_run())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        else:
+            self.shared += 1
+        return copy.deepcopy(await asyncio.shield(task)), False
+
+    def stats(self) -> dict:
+        return {
+            "memory":    self.memory.stats(),
+            "disk":      self.disk.stats() if self.disk else None,
+            "in_flight": len(self._inflight),
+            "shared":    self.shared,
+        }
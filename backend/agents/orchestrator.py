@@ -1,21 +1,38 @@
 """
 Orchestration Agent
-Uses Groq (Llama 3.3 70B) to synthesize outputs from all four agents
+Uses Groq (Llama 3.3 70B, via the async llm_client) to synthesize outputs from all four agents
 into a unified risk assessment and actionable recommendations.
 
 The orchestrator is self-fetching: when context params (state_id,
 commodity_id, market_id, lat, lon) are provided, it calls all agents
-in parallel before invoking the LLM reasoning layer.
+in parallel before invoking the LLM reasoning layer. stream_orchestration
+exposes the same flow as events (agent results first, then LLM tokens).
+
+Unambiguous cases are answered by the rule-based synthesizer in
+agents/orchestrator_rules.py; only conflicting, high-risk or low-confidence
+cases escalate to the LLM (ORCHESTRATION_FAST_PATH / ORCHESTRATION_CONFIDENCE_GATE).
 """
 
 import json
 import asyncio
 from datetime import datetime
-from groq import Groq
-from config import GROQ_API_KEY, GROQ_MODEL
-from domains.market import get_market_data, resolve_coords_for_state
+from typing import AsyncIterator
+from config import (
+    GROQ_API_KEY,
+    GROQ_MODEL,
+    ORCHESTRATION_FAST_PATH,
+    ORCHESTRATION_CONFIDENCE_GATE,
+    ORCHESTRATION_CACHE_SIZE,
+    ORCHESTRATION_CACHE_TTL,
+    ORCHESTRATION_CACHE_DISK,
+    ORCHESTRATION_CACHE_PATH,
+)
+from llm_client import chat_completion, stream_chat_completion
+from domains.market import get_market_snapshot, resolve_coords_for_state
 from agents.climate_agent import get_climate_risk
 from agents.satellite_agent import get_satellite_health
+from agents.orchestrator_rules import synthesize
+from agents.orchestration_cache import OrchestrationCache, canonical_inputs, semantic_key
 
 
 SYSTEM_PROMPT = """You are an expert agricultural intelligence orchestrator.
@@ -87,46 +104,33 @@ Rules:
 """
 
 
-async def run_orchestration(agent_data: dict) -> dict:
-    """
-    Self-fetching orchestrator: accepts context params and calls all agents
-    in parallel before passing combined data to the Groq LLM.
-    """
-    if not GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY is not set. Please add it to your .env file.")
+class _LLMFormatError(Exception):
+    def __init__(self, response_text: str):
+        super().__init__("LLM returned non-JSON output")
+        self.response_text = response_text
 
-    # ── Extract context params (text-based, matching CSV columns) ──
-    region    = str(agent_data.get("region",    "Kerala_Kottayam"))
-    commodity = str(agent_data.get("commodity", "Banana"))
-    lat       = agent_data.get("lat")
-    lon       = agent_data.get("lon")
 
-    # Resolve coordinates from region name if not provided
-    if lat is None or lon is None:
-        lat, lon = resolve_coords_for_state(region)
+_response_cache = OrchestrationCache(
+    maxsize=ORCHESTRATION_CACHE_SIZE,
+    ttl=ORCHESTRATION_CACHE_TTL,
+    disk_path=ORCHESTRATION_CACHE_PATH if ORCHESTRATION_CACHE_DISK else None,
+)
 
-    # ── Parallel agent calls ──
-    market_task   = get_market_data(region, commodity)
-    climate_task  = get_climate_risk(lat, lon)
-    satellite_task = get_satellite_health(lat, lon)
 
-    market_result, climate_result, satellite_result = await asyncio.gather(
-        market_task, climate_task, satellite_task,
-        return_exceptions=True,
-    )
-
-    # Safely unwrap results (replace exceptions with error dicts)
-    def _safe(result, label):
-        if isinstance(result, Exception):
-            return {"status": "error", "error": str(result), "agent": label}
-        return result
+def get_response_cache() -> OrchestrationCache:
+    return _response_cache
 
-    market_data   = agent_data.get("market")   or _safe(market_result,   "market")
-    climate_data  = agent_data.get("climate")  or _safe(climate_result,  "climate")
-    satellite_data = agent_data.get("satellite") or _safe(satellite_result, "satellite")
-    vision_data   = agent_data.get("vision")
 
-    # ── Build LLM user message ──
+def _build_user_message(
+    region: str,
+    commodity: str,
+    lat: float,
+    lon: float,
+    market_data: dict,
+    climate_data: dict,
+    satellite_data: dict,
+    vision_data: dict | None,
+) -> str:
     user_message = "Analyze the following agent outputs and provide your orchestrated assessment:\n\n"
     user_message += f"## Context\nRegion: {region} | Commodity: {commodity}\nCoordinates: {lat:.4f}°N, {lon:.4f}°E\n\n"
 
@@ -139,47 +143,209 @@ async def run_orchestration(agent_data: dict) -> dict:
     user_message += f"## Satellite Health Agent Output\n```json\n{json.dumps(satellite_data, indent=2)}\n```\n\n"
     user_message += f"## Market Intelligence Agent Output\n```json\n{json.dumps(market_data, indent=2)}\n```\n\n"
     user_message += f"Current timestamp: {datetime.now().strftime('%Y-%m-%d %I:%M %p')}"
+    return user_message
 
-    # ── Call Groq ──
-    client = Groq(api_key=GROQ_API_KEY)
-    chat_completion = client.chat.completions.create(
-        messages=[
+
+async def _call_llm(user_message: str) -> dict:
+    response_text = await chat_completion(
+        [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user",   "content": user_message},
         ],
-        model=GROQ_MODEL,
         temperature=0.3,
         max_tokens=2000,
-        response_format={"type": "json_object"},
+        json_mode=True,
     )
 
-    response_text = chat_completion.choices[0].message.content
-
     try:
-        result = json.loads(response_text)
+        return json.loads(response_text)
     except json.JSONDecodeError:
-        result = {
-            "agents": [],
-            "overall_status": "Under Review",
-            "consensus_score": 0,
-            "risk_level": "Moderate",
-            "ai_recommendation": "HOLD",
-            "recommendation_reason": "Orchestration produced non-standard output. Manual review recommended.",
-            "action_summary": "Manual review recommended.",
-            "biological_controls": [],
-            "chemical_advisory": {
-                "recommendation": "Pending Review",
-                "notes": response_text[:500],
-                "restrictions": [],
-            },
-            "conflicts": ["LLM output format error — manual review needed"],
-        }
-
-    # ── Attach raw agent data to response ──
+        # Not cached: the next request gets a fresh attempt
+        raise _LLMFormatError(response_text)
+
+
+def _stream_llm(user_message: str) -> AsyncIterator[str]:
+    return stream_chat_completion(
+        [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user",   "content": user_message},
+        ],
+        temperature=0.3,
+        max_tokens=2000,
+        json_mode=True,
+    )
+
+
+def _format_error_result(response_text: str) -> dict:
+    return {
+        "agents": [],
+        "overall_status": "Under Review",
+        "consensus_score": 0,
+        "risk_level": "Moderate",
+        "ai_recommendation": "HOLD",
+        "recommendation_reason": "Orchestration produced non-standard output. Manual review recommended.",
+        "action_summary": "Manual review recommended.",
+        "biological_controls": [],
+        "chemical_advisory": {
+            "recommendation": "Pending Review",
+            "notes": response_text[:500],
+            "restrictions": [],
+        },
+        "conflicts": ["LLM output format error — manual review needed"],
+    }
+
+
+def _safe(result, label):
+    """Replace an agent exception with an error dict."""
+    if isinstance(result, Exception):
+        return {"status": "error", "error": str(result), "agent": label}
+    return result
+
+
+async def _market_card(region: str, commodity: str) -> dict:
+    """Market snapshot → enriched price card + rule-based trade signal."""
+    snapshot = await get_market_snapshot(region, commodity)
+    return {**snapshot["enriched"], "recommendation": snapshot["recommendation"]}
+
+
+async def _labelled(label: str, coro):
+    try:
+        return label, await coro
+    except Exception as e:
+        return label, e
+
+
+async def stream_orchestration(
+    agent_data: dict,
+    stream_tokens: bool = True,
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    Run the orchestration as a sequence of (event, payload) pairs:
+
+      context           region / commodity / coordinates
+      market|climate|satellite   each agent result as soon as it is ready
+      token             LLM content deltas (only when the LLM is needed and
+                        stream_tokens is set)
+      result            the final response, same schema as run_orchestration
+    """
+    # ── Extract context params (text-based, matching CSV columns) ──
+    region    = str(agent_data.get("region",    "Kerala_Kottayam"))
+    commodity = str(agent_data.get("commodity", "Banana"))
+    lat       = agent_data.get("lat")
+    lon       = agent_data.get("lon")
+
+    # Resolve coordinates from region name if not provided
+    if lat is None or lon is None:
+        lat, lon = resolve_coords_for_state(region)
+
+    yield "context", {"region": region, "commodity": commodity, "lat": lat, "lon": lon}
+
+    # ── Parallel agent calls (skipped for data supplied by the caller) ──
+    fetchers = {
+        "market":    lambda: _market_card(region, commodity),
+        "climate":   lambda: get_climate_risk(lat, lon),
+        "satellite": lambda: get_satellite_health(lat, lon),
+    }
+    agents = {label: agent_data.get(label) for label in fetchers}
+    pending = [
+        asyncio.ensure_future(_labelled(label, fetch()))
+        for label, fetch in fetchers.items() if not agents[label]
+    ]
+    for label in fetchers:
+        if agents[label]:
+            yield label, agents[label]
+    for next_done in asyncio.as_completed(pending):
+        label, result = await next_done
+        agents[label] = _safe(result, label)
+        yield label, agents[label]
+
+    market_data    = agents["market"]
+    climate_data   = agents["climate"]
+    satellite_data = agents["satellite"]
+    vision_data    = agent_data.get("vision")
+
+    def _final(result: dict) -> dict:
+        return _attach_context(
+            result, region, commodity, lat, lon,
+            market_data, climate_data, satellite_data, vision_data,
+        )
+
+    # ── Rule-based fast path ──
+    escalations = []
+    if ORCHESTRATION_FAST_PATH:
+        result, escalations = synthesize(
+            region, commodity, climate_data, satellite_data, market_data, vision_data,
+            confidence_gate=ORCHESTRATION_CONFIDENCE_GATE,
+        )
+        if not escalations:
+            result["synthesis"] = "rules"
+            yield "result", _final(result)
+            return
+
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY is not set. Please add it to your .env file.")
+
+    # ── LLM synthesis, shared across requests with the same bucketed signals ──
+    view = canonical_inputs(region, commodity, climate_data, satellite_data, market_data, vision_data)
+    key = semantic_key(view, GROQ_MODEL)
+    user_message = _build_user_message(
+        region, commodity, lat, lon, market_data, climate_data, satellite_data, vision_data,
+    )
+
+    result = await _response_cache.get(key) if stream_tokens else None
+    cached = result is not None
+    if stream_tokens and not cached:
+        parts = []
+        async for delta in _stream_llm(user_message):
+            parts.append(delta)
+            yield "token", {"text": delta}
+        response_text = "".join(parts)
+        try:
+            result = json.loads(response_text)
+            await _response_cache.set(key, result)
+        except json.JSONDecodeError:
+            result = _format_error_result(response_text)
+    elif not cached:
+        try:
+            result, cached = await _response_cache.get_or_create(key, lambda: _call_llm(user_message))
+        except _LLMFormatError as e:
+            result = _format_error_result(e.response_text)
+
+    result["cached"] = cached
+    result["synthesis"] = "llm"
+    if escalations:
+        result["escalation_reasons"] = escalations
+
+    yield "result", _final(result)
+
+
+async def run_orchestration(agent_data: dict) -> dict:
+    """
+    Self-fetching orchestrator: accepts context params and calls all agents
+    in parallel, then synthesizes locally or — when the rules are not
+    confident — passes combined data to the Groq LLM.
+    """
+    async for event, payload in stream_orchestration(agent_data, stream_tokens=False):
+        if event == "result":
+            return payload
+    raise RuntimeError("Orchestration finished without a result")
+
+
+def _attach_context(
+    result: dict,
+    region: str,
+    commodity: str,
+    lat: float,
+    lon: float,
+    market_data: dict,
+    climate_data: dict,
+    satellite_data: dict,
+    vision_data: dict | None,
+) -> dict:
+    """Attach the request context and raw agent data to the response."""
     result["context"] = {
-        "state_id":     state_id,
-        "commodity_id": commodity_id,
-        "market_id":    market_id,
+        "region":       region,
+        "commodity":    commodity,
         "lat":          lat,
         "lon":          lon,
     }
@@ -0,0 +1,253 @@
+"""
+Rule-based Orchestration
+Deterministic synthesis of the climate, satellite, vision and market agent
+outputs into the same response schema the LLM orchestrator returns.
+
+Unambiguous inputs (e.g. Low climate risk, Low vegetation stress, rising
+market) are answered locally in milliseconds. `synthesize` also reports the
+reasons a case should be escalated to the LLM: High risk, conflicting agents,
+missing agents, or a consensus score below the confidence gate.
+"""
+
+from agents.climate_agent import _classify_risk
+from agents.satellite_agent import _classify_stress
+from domains.market.market_signals import compute_trade_recommendation
+
+_RISK_RANK = {"Low": 0, "Moderate": 1, "High": 2}
+_RANK_RISK = {v: k for k, v in _RISK_RANK.items()}
+_STRESS_RANK = {"Low": 0, "Moderate": 1, "High": 2, "Severe": 2}
+
+# Per-agent confidence when the agent returned a usable, rule-derived result
+_CLIMATE_CONFIDENCE = 90
+_SATELLITE_CONFIDENCE = 85
+
+_BIOLOGICAL_CONTROLS = {
+    "Low": [
+        {
+            "name": "Trichoderma harzianum",
+            "application": "Soil application with farmyard manure at 2.5 kg/acre as a preventive measure.",
+            "priority": "Low",
+        },
+    ],
+    "Moderate": [
+        {
+            "name": "Pseudomonas fluorescens",
+            "application": "Foliar spray at 10 g/L every 10–15 days while humid conditions persist.",
+            "priority": "Medium",
+        },
+        {
+            "name": "Trichoderma harzianum",
+            "application": "Soil application with farmyard manure at 2.5 kg/acre around the root zone.",
+            "priority": "Medium",
+        },
+    ],
+    "High": [
+        {
+            "name": "Pseudomonas fluorescens",
+            "application": "Foliar spray at 10 g/L every 7 days; remove and destroy infected leaves first.",
+            "priority": "High",
+        },
+        {
+            "name": "Bacillus subtilis",
+            "application": "Foliar spray at 5 g/L, alternating with Pseudomonas, in the early morning.",
+            "priority": "High",
+        },
+    ],
+}
+
+_CHEMICAL_ADVISORY = {
+    "Low": {
+        "recommendation": "Not Required",
+        "notes": "Conditions do not justify chemical intervention. Continue routine field scouting.",
+        "restrictions": ["Avoid prophylactic fungicide sprays"],
+    },
+    "Moderate": {
+        "recommendation": "Minimal Use",
+        "notes": "Rely on biological controls first; use a registered fungicide only if symptoms spread.",
+        "restrictions": ["Follow label dose and pre-harvest interval", "Do not spray before forecast rain"],
+    },
+    "High": {
+        "recommendation": "Targeted Application",
+        "notes": "Spot-treat affected plots with a registered fungicide alongside biological controls.",
+        "restrictions": [
+            "Follow label dose and pre-harvest interval",
+            "Rotate fungicide modes of action",
+            "Do not spray before forecast rain",
+        ],
+    },
+}
+
+
+def _failed(data) -> bool:
+    return not data or data.get("status") == "error"
+
+
+def _climate_level(climate: dict) -> str | None:
+    if _failed(climate):
+        return None
+    if "outbreak_probability" in climate:
+        return _classify_risk(float(climate["outbreak_probability"]))
+    return climate.get("risk_level")
+
+
+def _stress_level(satellite: dict) -> str | None:
+    if _failed(satellite):
+        return None
+    if "ndvi_score" in satellite:
+        return _classify_stress(float(satellite["ndvi_score"]))
+    return satellite.get("vegetation_stress")
+
+
+def _vision_finding(vision: dict | None) -> tuple[bool, float] | None:
+    """(disease_detected, confidence) or None when there is no usable result."""
+    if not vision or vision.get("disease_name") in (None, "No result"):
+        return None
+    confidence = float(vision.get("confidence", 0))
+    return "healthy" not in vision["disease_name"].lower(), confidence
+
+
+def synthesize(
+    region: str,
+    commodity: str,
+    climate: dict,
+    satellite: dict,
+    market: dict,
+    vision: dict | None,
+    confidence_gate: float,
+) -> tuple[dict, list[str]]:
+    """
+    Build an orchestration result from the agent outputs.
+
+    Returns (result, escalations); an empty escalation list means the
+    rule-based result is confident enough to return without the LLM.
+    """
+    agents, conflicts, escalations = [], [], []
+
+    # ── Climate ──
+    climate_level = _climate_level(climate)
+    if climate_level is None:
+        agents.append({
+            "name": "Climate Risk Agent", "status": "Pending", "confidence": 0,
+            "reasoning": "Weather data unavailable.",
+        })
+        escalations.append("climate data unavailable")
+    else:
+        agents.append({
+            "name": "Climate Risk Agent", "status": "Verified", "confidence": _CLIMATE_CONFIDENCE,
+            "reasoning": f"{climate_level} outbreak risk "
+                         f"({climate.get('outbreak_probability', 'n/a')}% probability).",
+        })
+
+    # ── Satellite ──
+    stress_level = _stress_level(satellite)
+    if stress_level is None:
+        agents.append({
+            "name": "Satellite Health Agent", "status": "Pending", "confidence": 0,
+            "reasoning": "Vegetation data unavailable.",
+        })
+        escalations.append("satellite data unavailable")
+    else:
+        agents.append({
+            "name": "Satellite Health Agent", "status": "Verified", "confidence": _SATELLITE_CONFIDENCE,
+            "reasoning": f"{stress_level} vegetation stress (NDVI {satellite.get('ndvi_score', 'n/a')}), "
+                         f"trend {satellite.get('health_trend', 'unknown')}.",
+        })
+
+    # ── Vision ──
+    finding = _vision_finding(vision)
+    if finding is None:
+        agents.append({
+            "name": "Vision Detection Agent", "status": "Pending", "confidence": 0,
+            "reasoning": "No image has been analyzed yet.",
+        })
+    else:
+        diseased, vision_confidence = finding
+        agents.append({
+            "name": "Vision Detection Agent",
+            "status": "Verified" if vision_confidence >= 60 else "Pending",
+            "confidence": vision_confidence,
+            "reasoning": f"Detected {vision['disease_name']} at {vision_confidence}% confidence.",
+        })
+
+    # ── Combined disease risk ──
+    risk_rank = _RISK_RANK.get(climate_level, 1)
+    if stress_level is not None and _STRESS_RANK[stress_level] == 2:
+        risk_rank = max(risk_rank, 1)
+    if finding is not None and finding[0] and finding[1] >= 50:
+        risk_rank = max(risk_rank, 2 if finding[1] >= 75 else 1)
+    risk_level = _RANK_RISK[risk_rank]
+
+    # ── Conflicts between agents ──
+    if finding is not None and finding[1] >= 50:
+        if finding[0] and climate_level == "Low":
+            conflicts.append("Vision detects disease while climate risk is Low.")
+        if not finding[0] and climate_level == "High":
+            conflicts.append("Vision reports a healthy leaf while climate risk is High.")
+    if climate_level == "Low" and stress_level in ("High", "Severe"):
+        conflicts.append(f"Climate risk is Low but vegetation stress is {stress_level}.")
+    for message in conflicts:
+        escalations.append(f"conflict: {message}")
+
+    # ── Market ──
+    if _failed(market):
+        trade = compute_trade_recommendation("stable", "Stable", "neutral", risk_level)
+        agents.append({
+            "name": "Market Intelligence Agent", "status": "Pending", "confidence": 0,
+            "reasoning": "Market data unavailable.",
+        })
+        escalations.append("market data unavailable")
+    else:
+        momentum = market.get("momentum") or {}
+        trade = compute_trade_recommendation(
+            trend        = market.get("trend", "stable"),
+            buyer_signal = market.get("buyer_signal", "Stable"),
+            momentum     = momentum.get("momentum", "neutral") if isinstance(momentum, dict) else momentum,
+            risk_level   = risk_level,
+        )
+        agents.append({
+            "name": "Market Intelligence Agent", "status": "Verified", "confidence": trade["confidence"],
+            "reasoning": f"Price trend {market.get('trend', 'stable')}, "
+                         f"buyer signal {market.get('buyer_signal', 'Stable')}.",
+        })
+
+    # Agents order as in the LLM schema: vision, climate, satellite, market
+    agents = [agents[2], agents[0], agents[1], agents[3]]
+
+    reporting = [a["confidence"] for a in agents if a["status"] != "Pending" or a["confidence"]]
+    consensus = sum(reporting) / len(reporting) if reporting else 0
+    consensus_score = max(0, min(100, round(consensus - 15 * len(conflicts))))
+
+    if risk_level == "High":
+        escalations.append("high disease risk")
+    if consensus_score < confidence_gate:
+        escalations.append(f"consensus {consensus_score} below gate {confidence_gate:g}")
+
+    if risk_level == "High":
+        overall_status = "Confirmed Threat" if finding and finding[0] else "Probable Threat"
+    elif risk_level == "Moderate" or conflicts:
+        overall_status = "Under Review"
+    else:
+        overall_status = "Low Risk"
+
+    action = {
+        "Low":      "Continue routine monitoring and preventive field hygiene.",
+        "Moderate": "Scout fields every 2–3 days and start biological controls preventively.",
+        "High":     "Inspect all plots immediately, remove infected tissue and apply biological controls.",
+    }[risk_level]
+
+    result = {
+        "agents": agents,
+        "overall_status": overall_status,
+        "consensus_score": consensus_score,
+        "risk_level": risk_level,
+        "ai_recommendation": trade["action"],
+        "recommendation_reason": f"{trade['reason']} Disease risk for {commodity} in {region} is {risk_level}.",
+        "action_summary": f"{action} Market signal: {trade['action']} — {trade['reason']}",
+        "biological_controls": [dict(c) for c in _BIOLOGICAL_CONTROLS[risk_level]],
+        "chemical_advisory": {
+            **_CHEMICAL_ADVISORY[risk_level],
+            "restrictions": list(_CHEMICAL_ADVISORY[risk_level]["restrictions"]),
+        },
+        "conflicts": conflicts,
+    }
+    return result, escalations
@@ -0,0 +1,136 @@
+"""
+Background Prefetch Scheduler
+Periodically refreshes climate and satellite data for every active region
+(REGION_COORDS + farmers' primary_region) into the local caches, so the
+user-facing endpoints read warm data instead of calling upstream APIs on
+the critical path.
+
+Runs as one asyncio task started from the FastAPI lifespan, with:
+  - jitter      cycles and per-region starts are randomly spread
+  - concurrency a semaphore bounds simultaneous upstream refreshes
+  - backoff     a failing region is retried with exponential backoff
+"""
+
+import asyncio
+import random
+import time
+
+from database import SessionLocal
+from models.db_models import FarmerProfile
+from domains.market.market_analyze import REGION_COORDS, resolve_coords_for_state
+from agents.climate_agent import refresh_climate_cell
+from agents.satellite_agent import sync_satellite_cell
+
+
+def _farmer_regions() -> set[str]:
+    db = SessionLocal()
+    try:
+        rows = db.query(FarmerProfile.primary_region).distinct().all()
+        return {r[0] for r in rows if r[0]}
+    finally:
+        db.close()
+
+
+async def active_regions() -> set[str]:
+    regions = set(REGION_COORDS)
+    try:
+        regions |= await asyncio.to_thread(_farmer_regions)
+    except Exception as e:
+        print(f"Prefetch: could not read farmer regions: {e}")
+    return regions
+
+
+class PrefetchScheduler:
+    def __init__(
+        self,
+        interval: float = 600.0,
+        concurrency: int = 4,
+        jitter: float = 0.1,
+        base_backoff: float = 60.0,
+        max_backoff: float = 3600.0,
+    ):
+        self.interval = interval
+        self.concurrency = max(1, concurrency)
+        self.jitter = jitter
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._task: asyncio.Task | None = None
+        self._failures: dict[str, int] = {}
+        self._retry_at: dict[str, float] = {}
+
+        self.cycles = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.last_cycle_seconds = 0.0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def _refresh_region(self, region: str, semaphore: asyncio.Semaphore) -> None:
+        if self._retry_at.get(region, 0) > time.monotonic():
+            return
+
+        # Spread region starts across the first part of the cycle
+        await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+
+        lat, lon = resolve_coords_for_state(region)
+        async with semaphore:
+            results = await asyncio.gather(
+                refresh_climate_cell(lat, lon),
+                sync_satellite_cell(lat, lon),
+                return_exceptions=True,
+            )
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            failures = self._failures.get(region, 0) + 1
+            self._failures[region] = failures
+            delay = min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+            self._retry_at[region] = time.monotonic() + self._jittered(delay)
+            self.failed += 1
+            print(f"Prefetch {region} failed ({failures}x), retry in {delay:.0f}s: {errors[0]}")
+        else:
+            self._failures.pop(region, None)
+            self._retry_at.pop(region, None)
+            self.refreshed += 1
+
+    async def run_cycle(self) -> None:
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        regions = await active_regions()
+        await asyncio.gather(*(self._refresh_region(r, semaphore) for r in sorted(regions)))
+        self.cycles += 1
+        self.last_cycle_seconds = round(time.monotonic() - started, 2)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                print(f"Prefetch cycle failed: {e}")
+            await asyncio.sleep(self._jittered(self.interval))
+
+    def stats(self) -> dict:
+        return {
+            "running":            self._task is not None and not self._task.done(),
+            "interval":           self.interval,
+            "cycles":             self.cycles,
+            "refreshed":          self.refreshed,
+            "failed":             self.failed,
+            "backing_off":        sorted(self._retry_at),
+            "last_cycle_seconds": self.last_cycle_seconds,
+        }
@@ -4,11 +4,20 @@ Fetches vegetation-related data from NASA POWER API (free, no key required)
 and computes a vegetation health index as a proxy for NDVI.
 """
 
-import httpx
+import asyncio
+import time
+import numpy as np
 from datetime import datetime, timedelta
-
-
-NASA_POWER_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+from config import (
+    NASA_POWER_URL,
+    SATELLITE_GRID_RES,
+    SATELLITE_STORE_PATH,
+    SATELLITE_FINAL_LAG_DAYS,
+    SATELLITE_SYNC_INTERVAL,
+)
+from http_clients import get_client
+from agents.numeric import round_like_python
+from agents.satellite_store import PowerDailyStore, PARAMETERS, series_by_parameter
 
 
 def _compute_vegetation_health(
@@ -66,6 +75,54 @@ def _compute_vegetation_health(
     return round(min(score, 1.0), 2)
 
 
+def _compute_vegetation_health_vec(
+    solar_radiation_avg: np.ndarray,
+    temperature_avg: np.ndarray,
+    humidity_avg: np.ndarray,
+    precipitation_sum: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorised _compute_vegetation_health: scores every day of a series or
+    every cell of a grid in one pass, identical to the scalar version.
+    """
+    s = np.asarray(solar_radiation_avg, dtype=np.float64)
+    t = np.asarray(temperature_avg, dtype=np.float64)
+    h = np.asarray(humidity_avg, dtype=np.float64)
+    p = np.asarray(precipitation_sum, dtype=np.float64)
+
+    score = np.zeros(np.broadcast(s, t, h, p).shape, dtype=np.float64)
+
+    # Solar radiation factor (30%)
+    score += np.select(
+        [(s >= 4) & (s <= 8), ((s >= 2) & (s < 4)) | ((s > 8) & (s <= 10))],
+        [0.30, 0.20],
+        0.08,
+    )
+
+    # Temperature factor (30%)
+    score += np.select(
+        [(t >= 15) & (t <= 30), ((t >= 5) & (t < 15)) | ((t > 30) & (t <= 40))],
+        [(1.0 - np.abs(t - 22.5) / 15) * 0.30, 0.10],
+        0.03,
+    )
+
+    # Moisture factor (40%) — humidity + rainfall
+    moisture = np.zeros_like(score)
+    moisture += np.select(
+        [(h >= 60) & (h <= 85), ((h >= 40) & (h < 60)) | ((h > 85) & (h <= 95))],
+        [0.25, 0.15],
+        0.05,
+    )
+    moisture += np.select(
+        [(p >= 2) & (p <= 15), ((p > 0) & (p < 2)) | ((p > 15) & (p <= 30)), p > 30],
+        [0.15, 0.08, 0.03],
+        0.0,
+    )
+    score += moisture
+
+    return round_like_python(np.minimum(score, 1.0), 2)
+
+
 def _classify_stress(ndvi: float) -> str:
     if ndvi >= 0.65:
         return "Low"
@@ -87,43 +144,110 @@ def _compute_trend(recent_ndvi: float, older_ndvi: float) -> str:
         return "Stable"
 
 
-async def get_satellite_health(lat: float, lon: float) -> dict:
-    """
-    Fetch vegetation-related environmental data from NASA POWER and
-    compute a synthetic vegetation health index.
-    """
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=14)
+def satellite_cell(lat: float, lon: float) -> tuple[float, float]:
+    """Snap coordinates to the centre of their SATELLITE_GRID_RES° grid cell."""
+    res = SATELLITE_GRID_RES
+    return (round(round(lat / res) * res, 4), round(round(lon / res) * res, 4))
+
 
+_store = PowerDailyStore(SATELLITE_STORE_PATH)
+_syncs: dict[tuple[float, float], asyncio.Task] = {}
+
+
+async def _fetch_power(cell: tuple[float, float], start: str, end: str) -> dict:
     params = {
-        "parameters": "ALLSKY_SFC_SW_DWN,T2M,RH2M,PRECTOTCORR",
+        "parameters": ",".join(PARAMETERS),
         "community": "AG",
-        "longitude": lon,
-        "latitude": lat,
-        "start": start_date.strftime("%Y%m%d"),
-        "end": end_date.strftime("%Y%m%d"),
+        "longitude": cell[1],
+        "latitude": cell[0],
+        "start": start,
+        "end": end,
         "format": "JSON",
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(NASA_POWER_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
+    response = await get_client("nasa_power").get(NASA_POWER_URL, params=params)
+    response.raise_for_status()
+    return response.json().get("properties", {}).get("parameter", {})
+
+
+async def _sync(cell: tuple[float, float], days: list[str]) -> None:
+    final = await asyncio.to_thread(_store.final_days, cell, days[0], days[-1])
+    missing = [d for d in days if d not in final]
+    if not missing:
+        return
+
+    # Only recent, not-yet-published days missing → re-check at most once per interval
+    lag_cutoff = (datetime.now() - timedelta(days=SATELLITE_FINAL_LAG_DAYS)).strftime("%Y%m%d")
+    if missing[0] >= lag_cutoff:
+        synced_at = await asyncio.to_thread(_store.last_synced, cell)
+        if synced_at and time.time() - synced_at < SATELLITE_SYNC_INTERVAL:
+            return
+
+    parameters = await _fetch_power(cell, missing[0], missing[-1])
+    await asyncio.to_thread(_store.upsert, cell, parameters, lag_cutoff)
+
+
+async def sync_satellite_cell(lat: float, lon: float, window_days: int = 14) -> tuple[float, float]:
+    """
+    Bring the local store up to date for the cell containing (lat, lon),
+    fetching only the missing days. Concurrent syncs of one cell share a fetch.
+    """
+    cell = satellite_cell(lat, lon)
+    end_date = datetime.now()
+    days = [
+        (end_date - timedelta(days=offset)).strftime("%Y%m%d")
+        for offset in range(window_days, -1, -1)
+    ]
+
+    task = _syncs.get(cell)
+    if task is None:
+        task = asyncio.get_running_loop().create_task(_sync(cell, days))
+        _syncs[cell] = task
+        task.add_done_callback(lambda _t, c=cell: _syncs.pop(c, None))
+    await asyncio.shield(task)
+    return cell
+
+
+def _daily_health(rows: list[tuple]) -> list[dict]:
+    """Score each stored day with all parameters present, oldest first."""
+    complete = [row for row in rows if all(v is not None for v in row[1:])]
+    if not complete:
+        return []
+    solar, temp, humidity, precip = np.array([row[1:] for row in complete], dtype=np.float64).T
+    scores = _compute_vegetation_health_vec(solar, temp, humidity, precip)
+    return [
+        {"date": f"{row[0][:4]}-{row[0][4:6]}-{row[0][6:]}", "ndvi": float(score)}
+        for row, score in zip(complete, scores)
+    ]
 
-    properties = data.get("properties", {}).get("parameter", {})
-    solar = properties.get("ALLSKY_SFC_SW_DWN", {})
-    temp = properties.get("T2M", {})
-    humidity = properties.get("RH2M", {})
-    precip = properties.get("PRECTOTCORR", {})
 
-    # Filter out fill values (-999)
-    def clean_values(d):
-        return [v for v in d.values() if v != -999.0 and v is not None]
+async def get_satellite_health(lat: float, lon: float) -> dict:
+    """
+    Compute a synthetic vegetation health index from NASA POWER data held in
+    the local store, syncing only the days missing since the last fetch.
+    `daily_health` scores each stored day on its own.
+    """
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=14)
+
+    cell = satellite_cell(lat, lon)
+    try:
+        await sync_satellite_cell(lat, lon)
+    except Exception as e:
+        # Serve what we already hold; fail only if there is nothing local
+        print(f"NASA POWER sync failed for {cell}: {e}")
+
+    rows = await asyncio.to_thread(
+        _store.load_days, cell, start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")
+    )
+    series = series_by_parameter(rows)
+    if not any(series.values()):
+        raise RuntimeError("No NASA POWER data available for this location")
 
-    solar_vals = clean_values(solar)
-    temp_vals = clean_values(temp)
-    humidity_vals = clean_values(humidity)
-    precip_vals = clean_values(precip)
+    solar_vals = series["ALLSKY_SFC_SW_DWN"]
+    temp_vals = series["T2M"]
+    humidity_vals = series["RH2M"]
+    precip_vals = series["PRECTOTCORR"]
 
     # Compute averages for recent (last 7 days) and older (previous 7 days)
     midpoint = max(len(solar_vals) // 2, 1)
@@ -149,6 +273,7 @@ async def get_satellite_health(lat: float, lon: float) -> dict:
         "ndvi_score": recent_ndvi,
         "vegetation_stress": _classify_stress(recent_ndvi),
         "health_trend": _compute_trend(recent_ndvi, older_ndvi),
+        "daily_health": _daily_health(rows),
         "data_source": "NASA POWER (AG Community)",
         "coverage_period": f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}",
         "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
@@ -0,0 +1,109 @@
+"""
+Satellite Data Store
+Local SQLite store of NASA POWER daily series per grid cell, so the
+satellite agent only fetches days it does not already hold.
+
+A day is stored as "final" once all parameters are published (no -999 fill
+values) or once it is older than the publication lag; final days are never
+fetched again. Recent, still-incomplete days are re-fetched at most once per
+sync interval.
+"""
+import sqlite3
+import threading
+import time
+
+PARAMETERS = ("ALLSKY_SFC_SW_DWN", "T2M", "RH2M", "PRECTOTCORR")
+FILL_VALUE = -999.0
+
+_COLUMNS = ("solar", "t2m", "rh2m", "precip")
+
+
+def _clean(value):
+    return None if value is None or value == FILL_VALUE else value
+
+
+class PowerDailyStore:
+    """Blocking SQLite access — call from a worker thread in async code."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS power_daily ("
+            " cell_lat REAL NOT NULL, cell_lon REAL NOT NULL, day TEXT NOT NULL,"
+            " solar REAL, t2m REAL, rh2m REAL, precip REAL,"
+            " final INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (cell_lat, cell_lon, day))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS power_sync ("
+            " cell_lat REAL NOT NULL, cell_lon REAL NOT NULL, synced_at REAL NOT NULL,"
+            " PRIMARY KEY (cell_lat, cell_lon))"
+        )
+        self._conn.commit()
+
+    def final_days(self, cell: tuple[float, float], start: str, end: str) -> set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day FROM power_daily WHERE cell_lat = ? AND cell_lon = ?"
+                " AND day BETWEEN ? AND ? AND final = 1",
+                (*cell, start, end),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def last_synced(self, cell: tuple[float, float]) -> float | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM power_sync WHERE cell_lat = ? AND cell_lon = ?", cell
+            ).fetchone()
+        return row[0] if row else None
+
+    def upsert(self, cell: tuple[float, float], parameters: dict, final_before: str) -> int:
+        """
+        Store a NASA POWER `properties.parameter` block. Days before
+        `final_before` (YYYYMMDD) are final even if some values are fill.
+        """
+        days = sorted(set().union(*(parameters.get(p, {}).keys() for p in PARAMETERS)))
+        rows = []
+        for day in days:
+            values = [_clean(parameters.get(p, {}).get(day)) for p in PARAMETERS]
+            final = int(all(v is not None for v in values) or day < final_before)
+            rows.append((*cell, day, *values, final))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO power_daily"
+                " (cell_lat, cell_lon, day, solar, t2m, rh2m, precip, final)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO power_sync (cell_lat, cell_lon, synced_at) VALUES (?, ?, ?)",
+                (*cell, time.time()),
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def load_days(self, cell: tuple[float, float], start: str, end: str) -> list[tuple]:
+        """Return (day, *PARAMETERS values) rows oldest→newest; fill values are None."""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT day, {', '.join(_COLUMNS)} FROM power_daily"
+                " WHERE cell_lat = ? AND cell_lon = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (*cell, start, end),
+            ).fetchall()
+
+    def load(self, cell: tuple[float, float], start: str, end: str) -> dict[str, list[float]]:
+        """Return {parameter: [values oldest→newest]} with fill values dropped."""
+        return series_by_parameter(self.load_days(cell, start, end))
+
+
+def series_by_parameter(rows: list[tuple]) -> dict[str, list[float]]:
+    """Per-parameter value lists from load_days rows, fill values dropped."""
+    return {
+        param: [row[i + 1] for row in rows if row[i + 1] is not None]
+        for i, param in enumerate(PARAMETERS)
+    }
@@ -4,32 +4,168 @@ Uses local Hugging Face Transformers model to classify plant diseases from leaf
 """
 
 from datetime import datetime
+from collections import Counter
+from typing import AsyncIterator
+import asyncio
 import io
+import threading
+from pathlib import Path
 import torch
 from PIL import Image
-from transformers import AutoImageProcessor, AutoModelForImageClassification
-from config import HF_VISION_MODEL
+from transformers import AutoConfig, AutoImageProcessor, AutoModelForImageClassification
+from config import (
+    HF_VISION_MODEL,
+    VISION_MAX_BATCH,
+    VISION_BATCH_WAIT_MS,
+    VISION_BACKEND,
+    VISION_ONNX_PATH,
+    VISION_NUM_THREADS,
+    VISION_PARITY_CHECK,
+    VISION_MMAP_WEIGHTS,
+    VISION_WEIGHTS_PATH,
+    VISION_CACHE_SIZE,
+    VISION_CACHE_TTL,
+    VISION_CACHE_DISK,
+    VISION_CACHE_PATH,
+    VISION_FAST_PREPROCESS,
+)
+from agents.vision_batcher import MicroBatcher
+from agents.vision_cache import VisionResultCache
+from agents.vision_preprocess import FastPreprocessor
+from agents.vision_backends import (
+    TorchBackend,
+    OnnxBackend,
+    check_parity,
+    export_onnx,
+    load_mmap_model,
+    quantize_dynamic_int8,
+)
 
 # Global cache for model and processor
 _model = None
 _processor = None
+_backend = None
+_fast_preprocessor = None
+_model_lock = threading.Lock()
+_backend_lock = threading.Lock()
 
 
 def get_model():
-    """Lazy load the model and processor on first request."""
+    """Lazy load the model and processor on first request (thread-safe)."""
     global _model, _processor
-    if _model is None:
-        print(f"Loading vision model: {HF_VISION_MODEL}...")
-        try:
-            _processor = AutoImageProcessor.from_pretrained(HF_VISION_MODEL)
-            _model = AutoModelForImageClassification.from_pretrained(HF_VISION_MODEL)
-            print("Vision model loaded successfully.")
-        except Exception as e:
-            print(f"Error loading vision model: {e}")
-            raise e
+    if _model is not None:
+        return _model, _processor
+
+    with _model_lock:
+        if _model is None:
+            print(f"Loading vision model: {HF_VISION_MODEL}...")
+            try:
+                if _processor is None:
+                    _processor = AutoImageProcessor.from_pretrained(HF_VISION_MODEL)
+                _model = _load_torch_model()
+                print("Vision model loaded successfully.")
+            except Exception as e:
+                print(f"Error loading vision model: {e}")
+                raise e
     return _model, _processor
 
 
+def _load_torch_model():
+    """Full-precision weights — memory-mapped and shared across workers if enabled."""
+    if VISION_MMAP_WEIGHTS:
+        return load_mmap_model(HF_VISION_MODEL, Path(VISION_WEIGHTS_PATH))
+    return AutoModelForImageClassification.from_pretrained(HF_VISION_MODEL)
+
+
+def get_processor():
+    """Image processor only — the ONNX backend never needs the torch weights."""
+    global _processor
+    if _processor is None:
+        with _model_lock:
+            if _processor is None:
+                _processor = AutoImageProcessor.from_pretrained(HF_VISION_MODEL)
+    return _processor
+
+
+def _image_size() -> int:
+    processor = get_processor()
+    crop = getattr(processor, "crop_size", None) or {}
+    size = getattr(processor, "size", None) or {}
+    return int(crop.get("height") or size.get("height") or size.get("shortest_edge") or 224)
+
+
+def _load_backend(kind: str):
+    if VISION_NUM_THREADS > 0:
+        torch.set_num_threads(VISION_NUM_THREADS)
+
+    if kind == "onnx":
+        onnx_path = Path(VISION_ONNX_PATH)
+        if not onnx_path.exists():
+            print(f"Exporting vision model to ONNX: {onnx_path}...")
+            model, _ = get_model()
+            export_onnx(model, onnx_path, _image_size())
+        id2label = AutoConfig.from_pretrained(HF_VISION_MODEL).id2label
+        return OnnxBackend(onnx_path, id2label, VISION_NUM_THREADS)
+
+    if kind == "torch_int8":
+        # Quantise a private copy in place so only the int8 weights stay resident
+        model = _load_torch_model()
+        return TorchBackend("torch_int8", quantize_dynamic_int8(model, inplace=True), model.config.id2label)
+
+    if kind != "torch":
+        print(f"Unknown VISION_BACKEND '{kind}', falling back to torch.")
+    model, _ = get_model()
+    return TorchBackend("torch", model, model.config.id2label)
+
+
+def get_backend():
+    """Build the configured inference backend (VISION_BACKEND) once."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                print(f"Loading vision backend: {VISION_BACKEND}...")
+                _backend = _load_backend(VISION_BACKEND)
+                if VISION_PARITY_CHECK and _backend.name != "torch":
+                    print(f"Vision backend parity: {run_parity_check()}")
+    return _backend
+
+
+def run_parity_check(images: list[bytes] | None = None) -> dict:
+    """
+    Compare the configured backend's top-5 labels against the full-precision
+    reference model, on the given images or a fixed random batch.
+    """
+    backend = get_backend()
+    model, _ = get_model()
+    reference = TorchBackend("torch", model, model.config.id2label)
+    samples = torch.stack([_preprocess(b) for b in images]) if images else None
+    return check_parity(backend, reference, samples, _image_size())
+
+
+def preload_weights() -> None:
+    """
+    Load weights without running inference. Safe to call in a pre-fork master
+    (e.g. gunicorn --preload) so workers inherit the pages copy-on-write;
+    running inference before fork would start thread pools that do not
+    survive fork.
+    """
+    get_processor()
+    if VISION_BACKEND == "onnx":
+        if not Path(VISION_ONNX_PATH).exists():
+            model, _ = get_model()
+            export_onnx(model, Path(VISION_ONNX_PATH), _image_size())
+        return
+    get_backend()
+
+
+def warm_up() -> None:
+    """Load the backend and run one dummy inference so the first upload is fast."""
+    size = _image_size()
+    _infer_batch([torch.zeros(3, size, size)])
+    print(f"Vision backend '{get_backend().name}' warmed up.")
+
+
 # ── Severity heuristic based on confidence ──
 def _estimate_severity(confidence: float) -> str:
     if confidence >= 90:
@@ -49,58 +185,171 @@ def _clean_label(label: str) -> str:
     return parts.title()
 
 
-async def analyze_image(image_bytes: bytes) -> dict:
-    """
-    Classify plant disease using local Hugging Face model.
-    """
-    try:
-        model, processor = get_model()
-
-        # Load image from bytes
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-
-        # Preprocess
-        inputs = processor(images=image, return_tensors="pt")
-
-        # Inference
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
-            probs = torch.nn.functional.softmax(logits, dim=-1)
-
-        # Get top 5 predictions
-        top_probs, top_indices = torch.topk(probs, 5)
-        
-        top_predictions = []
-        for score, idx in zip(top_probs[0], top_indices[0]):
-            label = model.config.id2label[idx.item()]
-            top_predictions.append({
-                "label": _clean_label(label),
+def _get_fast_preprocessor():
+    """FastPreprocessor mirroring the HF processor, or None if unsupported/disabled."""
+    global _fast_preprocessor
+    if _fast_preprocessor is None and VISION_FAST_PREPROCESS:
+        try:
+            _fast_preprocessor = FastPreprocessor(get_processor())
+        except ValueError as e:
+            print(f"Fast preprocessing unavailable, using HF processor: {e}")
+            _fast_preprocessor = False
+    return _fast_preprocessor or None
+
+
+def _preprocess(image_bytes: bytes) -> torch.Tensor:
+    """Decode + preprocess one upload into a (3, H, W) pixel tensor."""
+    fast = _get_fast_preprocessor()
+    if fast is not None:
+        return torch.from_numpy(fast(image_bytes))
+
+    processor = get_processor()
+    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    inputs = processor(images=image, return_tensors="pt")
+    return inputs["pixel_values"][0]
+
+
+def _infer_batch(pixel_values: list[torch.Tensor]) -> list[list[dict]]:
+    """Run one forward pass over a stacked batch and return top-5 per image."""
+    backend = get_backend()
+
+    with torch.no_grad():
+        logits = backend(torch.stack(pixel_values))
+        probs = torch.nn.functional.softmax(logits, dim=-1)
+
+    k = min(5, probs.shape[-1])
+    top_probs, top_indices = torch.topk(probs, k)
+
+    results = []
+    for row_probs, row_indices in zip(top_probs, top_indices):
+        results.append([
+            {
+                "label": _clean_label(backend.id2label[idx.item()]),
                 "confidence": round(score.item() * 100, 2),
-            })
-
-        if not top_predictions:
-            return {
-                "disease_name": "No result",
-                "confidence": 0.0,
-                "severity_stage": "Unknown",
-                "top_predictions": [],
-                "analyzed_at": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
             }
+            for score, idx in zip(row_probs, row_indices)
+        ])
+    return results
+
+
+_batcher = MicroBatcher(
+    _infer_batch,
+    max_batch=VISION_MAX_BATCH,
+    max_wait_ms=VISION_BATCH_WAIT_MS,
+    name="vision",
+)
 
-        top = top_predictions[0]
 
+def get_batcher() -> MicroBatcher:
+    return _batcher
+
+
+_result_cache = VisionResultCache(
+    HF_VISION_MODEL,
+    VISION_BACKEND,
+    preprocess="fast" if VISION_FAST_PREPROCESS else "hf",
+    maxsize=VISION_CACHE_SIZE,
+    ttl=VISION_CACHE_TTL,
+    disk_path=VISION_CACHE_PATH if VISION_CACHE_DISK else None,
+)
+
+
+def get_result_cache() -> VisionResultCache:
+    return _result_cache
+
+
+def _build_result(top_predictions: list[dict]) -> dict:
+    if not top_predictions:
         return {
-            "disease_name": top["label"],
-            "confidence": top["confidence"],
-            "severity_stage": _estimate_severity(top["confidence"]),
-            "top_predictions": top_predictions,
+            "disease_name": "No result",
+            "confidence": 0.0,
+            "severity_stage": "Unknown",
+            "top_predictions": [],
             "analyzed_at": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
         }
 
+    top = top_predictions[0]
+
+    return {
+        "disease_name": top["label"],
+        "confidence": top["confidence"],
+        "severity_stage": _estimate_severity(top["confidence"]),
+        "top_predictions": top_predictions,
+        "analyzed_at": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
+    }
+
+
+async def analyze_image(image_bytes: bytes) -> dict:
+    """
+    Classify plant disease using local Hugging Face model.
+    Identical uploads are served from the content-hash cache; otherwise
+    decoding runs in a worker thread and inference is micro-batched with
+    other concurrent uploads.
+    """
+    try:
+        cache_key = await _result_cache.key_for(image_bytes)
+        cached = await _result_cache.get(cache_key)
+        if cached is not None:
+            return _build_result(cached)
+
+        pixel_values = await asyncio.to_thread(_preprocess, image_bytes)
+        top_predictions = await _batcher.submit(pixel_values)
+        if top_predictions:
+            await _result_cache.set(cache_key, top_predictions)
+        return _build_result(top_predictions)
+
     except Exception as e:
         print(f"Vision analysis failed: {e}")
         # Return a graceful error structure or re-raise
         raise ValueError(f"Model inference failed: {str(e)}")
 
 
+async def analyze_images(images: list[tuple[str, bytes]]) -> AsyncIterator[dict]:
+    """
+    Classify many leaf images (e.g. a plot survey). All images are decoded in
+    parallel and share micro-batches; one result dict is yielded per image as
+    it completes, followed by a plot-level summary with the disease
+    distribution.
+    """
+    async def _one(index: int, filename: str, image_bytes: bytes) -> dict:
+        try:
+            result = await analyze_image(image_bytes)
+            return {"type": "result", "index": index, "filename": filename, **result}
+        except Exception as e:
+            return {"type": "error", "index": index, "filename": filename, "error": str(e)}
+
+    tasks = [
+        asyncio.create_task(_one(i, name, data)) for i, (name, data) in enumerate(images)
+    ]
+
+    diseases = Counter()
+    confidences = []
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            item = await next_done
+            if item["type"] == "result":
+                diseases[item["disease_name"]] += 1
+                confidences.append(item["confidence"])
+            else:
+                failed += 1
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    analyzed = len(confidences)
+    healthy = sum(count for label, count in diseases.items() if "healthy" in label.lower())
+    yield {
+        "type": "summary",
+        "images": len(images),
+        "analyzed": analyzed,
+        "failed": failed,
+        "disease_distribution": [
+            {"label": label, "count": count, "share": round(count / analyzed * 100, 1)}
+            for label, count in diseases.most_common()
+        ],
+        "healthy_share": round(healthy / analyzed * 100, 1) if analyzed else 0.0,
+        "mean_confidence": round(sum(confidences) / analyzed, 2) if analyzed else 0.0,
+        "analyzed_at": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
+    }
@@ -0,0 +1,170 @@
+"""
+Vision Inference Backends
+Selectable CPU inference backends for the plant disease classifier
+(config: VISION_BACKEND):
+
+  - "torch"       full-precision Hugging Face model (reference)
+  - "torch_int8"  dynamic int8 quantisation of the reference model's Linear layers
+  - "onnx"        model exported to ONNX and run by ONNX Runtime
+
+Every backend takes a (N, 3, H, W) float tensor and returns (N, num_labels)
+logits, so the batching and top-5 code in vision_agent is backend-agnostic.
+`check_parity` compares a backend's top-5 labels against the reference model.
+`load_mmap_model` loads weights memory-mapped so several workers share one
+copy through the page cache.
+"""
+
+from pathlib import Path
+
+import os
+
+import torch
+from transformers import AutoConfig, AutoModelForImageClassification
+
+try:
+    import onnxruntime as ort
+except ImportError:  # only needed for VISION_BACKEND=onnx
+    ort = None
+
+BACKENDS = ("torch", "torch_int8", "onnx")
+
+
+class TorchBackend:
+    """Runs a (possibly quantised) torch module."""
+
+    def __init__(self, name: str, model: torch.nn.Module, id2label: dict):
+        self.name = name
+        self.model = model.eval()
+        self.id2label = id2label
+
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        with torch.no_grad():
+            return self.model(pixel_values=pixel_values).logits
+
+
+class OnnxBackend:
+    """Runs an exported ONNX graph on the CPU execution provider."""
+
+    def __init__(self, path: Path, id2label: dict, num_threads: int = 0):
+        if ort is None:
+            raise ImportError("onnxruntime is not installed; pip install onnxruntime")
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads > 0:
+            opts.intra_op_num_threads = num_threads
+        self.name = "onnx"
+        self.session = ort.InferenceSession(
+            str(path), sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.id2label = id2label
+
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        feed = {self.input_name: pixel_values.detach().cpu().numpy().astype("float32")}
+        return torch.from_numpy(self.session.run(None, feed)[0])
+
+
+_SUPPORTS_MMAP = tuple(int(p) for p in torch.__version__.split("+")[0].split(".")[:2]) >= (2, 1)
+
+
+def load_mmap_model(model_id: str, weights_path: Path) -> torch.nn.Module:
+    """
+    Load the classifier with its weights memory-mapped from a local snapshot.
+
+    The first call saves the downloaded state dict to `weights_path`; every
+    later load maps that file read-only, so the weight pages live in the OS
+    page cache and are shared by all uvicorn/gunicorn workers instead of
+    being copied into each process.
+
+    torch.load(mmap=True) and load_state_dict(assign=True) need torch 2.1+;
+    older versions fall back to a regular from_pretrained load.
+    """
+    if not _SUPPORTS_MMAP:
+        print(f"torch {torch.__version__} lacks mmap loading; using a regular load")
+        model = AutoModelForImageClassification.from_pretrained(model_id)
+        model.requires_grad_(False)
+        return model.eval()
+
+    if not weights_path.exists():
+        model = AutoModelForImageClassification.from_pretrained(model_id)
+        weights_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = weights_path.with_suffix(f".tmp{os.getpid()}")
+        torch.save(model.state_dict(), tmp)
+        os.replace(tmp, weights_path)
+        del model
+
+    config = AutoConfig.from_pretrained(model_id)
+    model = AutoModelForImageClassification.from_config(config)
+    state = torch.load(weights_path, mmap=True, weights_only=True, map_location="cpu")
+    model.load_state_dict(state, assign=True)
+    model.requires_grad_(False)
+    return model.eval()
+
+
+def quantize_dynamic_int8(model: torch.nn.Module, inplace: bool = False) -> torch.nn.Module:
+    """Dynamic int8 quantisation (weights int8, activations quantised on the fly)."""
+    return torch.ao.quantization.quantize_dynamic(
+        model.eval(), {torch.nn.Linear}, dtype=torch.qint8, inplace=inplace
+    )
+
+
+def export_onnx(model: torch.nn.Module, path: Path, image_size: int = 224) -> Path:
+    """Export the HF classifier to ONNX with a dynamic batch axis."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dummy = torch.randn(1, 3, image_size, image_size)
+
+    class _LogitsOnly(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, pixel_values):
+            return self.inner(pixel_values=pixel_values).logits
+
+    tmp = path.with_suffix(".onnx.tmp")
+    torch.onnx.export(
+        _LogitsOnly(model.eval()),
+        (dummy,),
+        str(tmp),
+        input_names=["pixel_values"],
+        output_names=["logits"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=17,
+    )
+    tmp.replace(path)
+    return path
+
+
+def check_parity(
+    backend,
+    reference,
+    samples: torch.Tensor | None = None,
+    image_size: int = 224,
+) -> dict:
+    """
+    Compare a backend's top-5 labels with the reference backend.
+    Uses a fixed-seed random batch when no real samples are supplied.
+    """
+    if samples is None:
+        generator = torch.Generator().manual_seed(0)
+        samples = torch.randn(8, 3, image_size, image_size, generator=generator)
+
+    ref_logits = reference(samples)
+    out_logits = backend(samples)
+
+    k = min(5, ref_logits.shape[-1])
+    ref_top = torch.topk(ref_logits, k).indices
+    out_top = torch.topk(out_logits, k).indices
+
+    top1 = (ref_top[:, 0] == out_top[:, 0]).float().mean().item()
+    top5 = sum(
+        len(set(r.tolist()) & set(o.tolist())) / k for r, o in zip(ref_top, out_top)
+    ) / len(ref_top)
+
+    return {
+        "backend":            backend.name,
+        "samples":            int(samples.shape[0]),
+        "top1_agreement":     round(top1, 4),
+        "top5_overlap":       round(top5, 4),
+        "max_abs_logit_diff": round((ref_logits - out_logits).abs().max().item(), 5),
+    }
@@ -0,0 +1,202 @@
+"""
+Vision Micro-Batcher
+Collects concurrent inference requests over a short window (up to a maximum
+batch size), runs the model once on the whole batch in a dedicated worker
+thread, and fans the per-item results back to the waiting callers.
+
+Exposes batch-size and queue-wait metrics for tuning throughput vs p99 latency.
+"""
+
+import asyncio
+import functools
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching scheduler.
+
+    `infer_batch` receives a list of items and must return a list of results
+    in the same order. It runs on a single worker thread, so batches execute
+    one at a time while the event loop keeps accepting requests.
+    """
+
+    def __init__(
+        self,
+        infer_batch: Callable[[list], list],
+        max_batch: int = 8,
+        max_wait_ms: float = 10.0,
+        name: str = "vision",
+        window: int = 1024,
+    ):
+        self.infer_batch = infer_batch
+        self.max_batch   = max(1, max_batch)
+        self.max_wait    = max(0.0, max_wait_ms) / 1000
+        self.name        = name
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-batch")
+
+        # ── Metrics ──
+        self._batches     = 0
+        self._items       = 0
+        self._errors      = 0
+        self._crashes     = 0
+        self._last_crash  = ""
+        self._size_hist: dict[int, int] = {}
+        self._queue_waits = deque(maxlen=window)   # seconds, per item
+        self._infer_times = deque(maxlen=window)   # seconds, per batch
+
+    # ── Lifecycle ──
+    def start(self) -> None:
+        """Start the scheduler loop on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            # Each run owns its queue and in-flight batch, so a run that exits
+            # after a restart only fails its own callers
+            queue, inflight = asyncio.Queue(), []
+            self._queue = queue
+            self._task = asyncio.get_running_loop().create_task(self._run(queue, inflight))
+            self._task.add_done_callback(functools.partial(self._on_loop_exit, queue, inflight))
+
+    def _on_loop_exit(self, queue: asyncio.Queue, inflight: list, task: asyncio.Task) -> None:
+        """
+        A scheduler run ended (stop() or an unexpected error): fail every
+        caller it still owed a result so none waits forever. The next
+        submit() starts a new run on a fresh queue.
+        """
+        if task.cancelled():
+            error = asyncio.CancelledError()
+        else:
+            error = task.exception() or RuntimeError(f"{self.name} batcher loop exited")
+            self._crashes += 1
+            self._last_crash = repr(error)
+            print(f"{self.name} batcher loop crashed: {error!r}")
+
+        pending = [future for _, future, _ in inflight]
+        inflight.clear()
+        while not queue.empty():
+            pending.append(queue.get_nowait()[1])
+
+        for future in pending:
+            if future.done():
+                continue
+            if isinstance(error, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(RuntimeError(f"{self.name} batcher failed: {error!r}"))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass   # a crashed run was already reported by _on_loop_exit
+            self._task = None
+
+    # ── Public API ──
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result."""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future, time.perf_counter()))
+        return await future
+
+    async def submit_many(self, items: list) -> list:
+        """Queue several items at once; results keep the input order."""
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    def metrics(self) -> dict:
+        waits = list(self._queue_waits)
+        infer = list(self._infer_times)
+        return {
+            "name":               self.name,
+            "max_batch":          self.max_batch,
+            "max_wait_ms":        round(self.max_wait * 1000, 2),
+            "queue_depth":        self._queue.qsize() if self._queue else 0,
+            "batches":            self._batches,
+            "items":              self._items,
+            "errors":             self._errors,
+            "healthy":            self._task is None or not self._task.done(),
+            "loop_crashes":       self._crashes,
+            "last_crash":         self._last_crash,
+            "avg_batch_size":     round(self._items / self._batches, 2) if self._batches else 0.0,
+            "batch_size_hist":    dict(sorted(self._size_hist.items())),
+            "queue_wait_ms_p50":  round(_percentile(waits, 50) * 1000, 2),
+            "queue_wait_ms_p99":  round(_percentile(waits, 99) * 1000, 2),
+            "infer_ms_p50":       round(_percentile(infer, 50) * 1000, 2),
+            "infer_ms_p99":       round(_percentile(infer, 99) * 1000, 2),
+        }
+
+    # ── Scheduler ──
+    async def _collect(self, queue: asyncio.Queue, inflight: list) -> list:
+        """Block for the first item, then fill the batch until size or deadline."""
+        loop  = asyncio.get_running_loop()
+        inflight.append(await queue.get())   # owned by the run until results are delivered
+        deadline = loop.time() + self.max_wait
+
+        while len(inflight) < self.max_batch:
+            # Drain anything already queued without waiting
+            if not queue.empty():
+                inflight.append(queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                inflight.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return list(inflight)
+
+    async def _run(self, queue: asyncio.Queue, inflight: list) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect(queue, inflight)
+
+            # Drop callers that already gave up
+            batch = [entry for entry in batch if not entry[1].done()]
+            inflight[:] = batch
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self._queue_waits.append(started - enqueued)
+
+            items = [item for item, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self._executor, self.infer_batch, items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"infer_batch returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                self._errors += 1
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                inflight.clear()
+                continue
+
+            self._infer_times.append(time.perf_counter() - started)
+            self._batches += 1
+            self._items   += len(batch)
+            self._size_hist[len(batch)] = self._size_hist.get(len(batch), 0) + 1
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            inflight.clear()
@@ -0,0 +1,64 @@
+"""
+Vision Result Cache
+Content-hash cache for leaf image analyses: duplicate uploads (re-sent photos,
+frontend retries) return the cached top-5 predictions without decoding or
+running the model.
+
+Key = BLAKE2b(image bytes) + model id + inference backend + preprocessing
+path (fast / hf), since each combination can produce slightly different logits.
+Tier 1: in-memory LRU with TTL. Tier 2 (optional): SQLite file next to jomee.db.
+"""
+
+import asyncio
+import hashlib
+
+from cache import TTLCache, SqliteCache
+
+# Hash large uploads off the event loop (hashlib releases the GIL)
+_INLINE_HASH_LIMIT = 1 << 20
+
+
+def _digest(image_bytes: bytes) -> str:
+    return hashlib.blake2b(image_bytes, digest_size=20).hexdigest()
+
+
+class VisionResultCache:
+    def __init__(
+        self,
+        model_id: str,
+        backend: str,
+        preprocess: str = "hf",
+        maxsize: int = 1024,
+        ttl: float = 86400.0,
+        disk_path: str | None = None,
+    ):
+        self.namespace = f"{model_id}|{backend}|{preprocess}"
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl, name="vision_results")
+        self.disk = SqliteCache(disk_path, table="vision_results", ttl=ttl) if disk_path else None
+
+    async def key_for(self, image_bytes: bytes) -> str:
+        if len(image_bytes) > _INLINE_HASH_LIMIT:
+            digest = await asyncio.to_thread(_digest, image_bytes)
+        else:
+            digest = _digest(image_bytes)
+        return f"{digest}|{self.namespace}"
+
+    async def get(self, key: str) -> list[dict] | None:
+        hit = self.memory.get(key)
+        if hit is not None or self.disk is None:
+            return hit
+        hit = await asyncio.to_thread(self.disk.get, key)
+        if hit is not None:
+            self.memory.set(key, hit)
+        return hit
+
+    async def set(self, key: str, top_predictions: list[dict]) -> None:
+        self.memory.set(key, top_predictions)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, top_predictions)
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "disk":   self.disk.stats() if self.disk else None,
+        }
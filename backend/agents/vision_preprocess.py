@@ -0,0 +1,123 @@
+"""
+Vision Fast Preprocessing
+Decode + resize + crop + normalise a leaf photo without materialising the
+full-resolution RGB image.
+
+JPEG uploads are decoded in PIL draft mode (libjpeg DCT scaling by 1/2, 1/4
+or 1/8), so a 12 MP phone photo is decoded at roughly the processor's resize
+target. Normalisation is one vectorised NumPy expression using the HF
+processor's own rescale factor, mean and std.
+
+`check_preprocess_parity` compares the output with the HF image processor:
+    python -m agents.vision_preprocess leaf1.jpg leaf2.jpg
+"""
+
+import io
+import sys
+
+import numpy as np
+from PIL import Image
+
+
+class FastPreprocessor:
+    """Mirror of an HF image processor's resize → center-crop → rescale → normalise."""
+
+    def __init__(self, processor):
+        size = dict(getattr(processor, "size", None) or {})
+        if "shortest_edge" in size:
+            self.shortest_edge = int(size["shortest_edge"])
+            self.resize_to = None
+        elif "height" in size and "width" in size:
+            self.shortest_edge = None
+            self.resize_to = (int(size["width"]), int(size["height"]))
+        else:
+            raise ValueError(f"Unsupported processor size config: {size}")
+
+        self.do_resize = getattr(processor, "do_resize", True)
+        self.resample = int(getattr(processor, "resample", Image.BILINEAR))
+
+        crop = dict(getattr(processor, "crop_size", None) or {})
+        self.do_center_crop = bool(getattr(processor, "do_center_crop", False)) and bool(crop)
+        self.crop = (int(crop.get("width", 0)), int(crop.get("height", 0)))
+
+        rescale = float(getattr(processor, "rescale_factor", 1 / 255)) if getattr(processor, "do_rescale", True) else 1.0
+        if getattr(processor, "do_normalize", True):
+            mean = np.asarray(processor.image_mean, dtype=np.float32)
+            std  = np.asarray(processor.image_std,  dtype=np.float32)
+        else:
+            mean = np.zeros(3, dtype=np.float32)
+            std  = np.ones(3, dtype=np.float32)
+
+        # (x * rescale - mean) / std  ==  x * scale - offset
+        self.scale  = (rescale / std).astype(np.float32)
+        self.offset = (mean / std).astype(np.float32)
+
+    def _target_size(self, width: int, height: int) -> tuple[int, int]:
+        if not self.do_resize:
+            return width, height
+        if self.resize_to is not None:
+            return self.resize_to
+        # Same rounding as transformers' get_resize_output_image_size
+        short, long = (width, height) if width <= height else (height, width)
+        new_short, new_long = self.shortest_edge, int(self.shortest_edge * long / short)
+        return (new_short, new_long) if width <= height else (new_long, new_short)
+
+    def __call__(self, image_bytes: bytes) -> np.ndarray:
+        """Return a (3, H, W) float32 array ready to stack into a batch."""
+        image = Image.open(io.BytesIO(image_bytes))
+        target = self._target_size(*image.size)
+
+        # JPEG: let libjpeg downscale during decode, never below the target
+        image.draft("RGB", target)
+        image = image.convert("RGB")
+
+        if image.size != target:
+            image = image.resize(target, resample=self.resample)
+
+        if self.do_center_crop:
+            crop_w, crop_h = self.crop
+            width, height = image.size
+            left = (width - crop_w) // 2
+            top  = (height - crop_h) // 2
+            image = image.crop((left, top, left + crop_w, top + crop_h))
+
+        pixels = np.asarray(image, dtype=np.float32)
+        pixels = pixels * self.scale - self.offset
+        return np.ascontiguousarray(pixels.transpose(2, 0, 1))
+
+
+def check_preprocess_parity(processor, images: list[bytes]) -> dict:
+    """
+    Compare FastPreprocessor against the HF processor on real images.
+    Draft-mode decoding is not bit-identical to full decode + resize, so
+    report the error magnitude rather than demanding equality.
+    """
+    fast = FastPreprocessor(processor)
+    max_abs, mean_abs = 0.0, 0.0
+    for image_bytes in images:
+        ours = fast(image_bytes)
+        reference = processor(
+            images=Image.open(io.BytesIO(image_bytes)).convert("RGB"),
+            return_tensors="np",
+        )["pixel_values"][0]
+        if ours.shape != reference.shape:
+            raise AssertionError(f"Shape mismatch: {ours.shape} vs {reference.shape}")
+        diff = np.abs(ours - reference)
+        max_abs = max(max_abs, float(diff.max()))
+        mean_abs += float(diff.mean()) / len(images)
+    return {
+        "images":       len(images),
+        "max_abs_diff": round(max_abs, 5),
+        "mean_abs_diff": round(mean_abs, 5),
+    }
+
+
+if __name__ == "__main__":
+    from transformers import AutoImageProcessor
+    from config import HF_VISION_MODEL
+
+    paths = sys.argv[1:]
+    if not paths:
+        sys.exit("usage: python -m agents.vision_preprocess IMAGE [IMAGE ...]")
+    hf_processor = AutoImageProcessor.from_pretrained(HF_VISION_MODEL)
+    print(check_preprocess_parity(hf_processor, [open(p, "rb").read() for p in paths]))
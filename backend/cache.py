@@ -0,0 +1,220 @@
+"""
+In-process caching primitives shared by the agents and domains.
+
+  - TTLCache     thread-safe LRU with per-entry TTL and hit/miss counters
+  - SqliteCache  optional on-disk tier (JSON values) in a SQLite file
+  - SWRCache     async cache with stale-while-revalidate and single-flight fetches
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, name: str = ""):
+        self.maxsize = max(1, maxsize)
+        self.ttl = ttl
+        self.name = name
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name":      self.name,
+            "size":      len(self._data),
+            "maxsize":   self.maxsize,
+            "ttl":       self.ttl,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SqliteCache:
+    """
+    Small persistent key/value cache with TTL, stored in its own SQLite file.
+    Values must be JSON-serialisable. Calls are blocking — run them off the
+    event loop (asyncio.to_thread) from async code.
+    """
+
+    def __init__(self, path: str, table: str = "cache", ttl: float = 86400.0):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= time.time():
+                self.misses += 1
+                return default
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        payload = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires),
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),)
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "path":      self.path,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SWRCache:
+    """
+    Async cache for upstream fetches.
+
+    - fresh for `ttl` seconds: served directly
+    - stale for a further `stale_ttl` seconds: served immediately while one
+      background refresh runs (stale-while-revalidate)
+    - older / missing: callers await the fetch; concurrent callers for the
+      same key share a single in-flight fetch (single-flight)
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, maxsize: int = 4096, name: str = ""):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = max(1, maxsize)
+        self.name = name
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_errors = 0
+
+    def peek(self, key: Hashable) -> tuple[Any, float] | None:
+        """Return (value, age_seconds) without counting a lookup, or None."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        return entry[1], time.monotonic() - entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start (or join) the single in-flight fetch for `key`."""
+        task = self._inflight.get(key)
+        if task is None:
+            async def _run():
+                value = await fetch()
+                self.set(key, value)
+                return value
+
+            task = asyncio.get_running_loop().create_task(_run())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+        return task
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.refresh_errors += 1
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self.refresh(key, fetch)
+                return entry[1]
+
+        self.misses += 1
+        return await asyncio.shield(self.refresh(key, fetch))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "name":           self.name,
+            "size":           len(self._data),
+            "ttl":            self.ttl,
+            "stale_ttl":      self.stale_ttl,
+            "hits":           self.hits,
+            "stale_hits":     self.stale_hits,
+            "misses":         self.misses,
+            "in_flight":      len(self._inflight),
+            "refresh_errors": self.refresh_errors,
+            "hit_ratio":      round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -14,3 +14,117 @@ HF_VISION_MODEL = os.getenv(
     "HF_VISION_MODEL",
     "ozair23/mobilenet_v2_1.0_224-finetuned-plantdisease",
 )
+
+# Market domain: bounded thread pool for pandas loading/aggregation
+MARKET_EXECUTOR_WORKERS = int(os.getenv("MARKET_EXECUTOR_WORKERS", "4"))
+
+# Vision agent: dynamic micro-batching of concurrent uploads
+VISION_MAX_BATCH = int(os.getenv("VISION_MAX_BATCH", "8"))
+VISION_BATCH_WAIT_MS = float(os.getenv("VISION_BATCH_WAIT_MS", "10"))
+
+# Vision agent: CPU inference backend — torch | torch_int8 | onnx
+VISION_BACKEND = os.getenv("VISION_BACKEND", "torch").lower()
+VISION_ONNX_PATH = os.getenv(
+    "VISION_ONNX_PATH",
+    os.path.join(os.path.dirname(__file__), "model_cache", HF_VISION_MODEL.replace("/", "__") + ".onnx"),
+)
+VISION_NUM_THREADS = int(os.getenv("VISION_NUM_THREADS", "0"))  # 0 = library default
+VISION_PARITY_CHECK = os.getenv("VISION_PARITY_CHECK", "false").lower() in ("1", "true", "yes")
+
+# Vision agent: startup warm-up and shared (memory-mapped) weights
+VISION_WARMUP = os.getenv("VISION_WARMUP", "true").lower() in ("1", "true", "yes")
+VISION_PRELOAD = os.getenv("VISION_PRELOAD", "false").lower() in ("1", "true", "yes")
+VISION_MMAP_WEIGHTS = os.getenv("VISION_MMAP_WEIGHTS", "true").lower() in ("1", "true", "yes")
+VISION_WEIGHTS_PATH = os.getenv(
+    "VISION_WEIGHTS_PATH",
+    os.path.join(os.path.dirname(__file__), "model_cache", HF_VISION_MODEL.replace("/", "__") + ".pt"),
+)
+
+# Vision agent: content-hash result cache (memory LRU + optional SQLite tier)
+VISION_CACHE_SIZE = int(os.getenv("VISION_CACHE_SIZE", "1024"))
+VISION_CACHE_TTL = float(os.getenv("VISION_CACHE_TTL", "86400"))
+VISION_CACHE_DISK = os.getenv("VISION_CACHE_DISK", "false").lower() in ("1", "true", "yes")
+VISION_CACHE_PATH = os.getenv(
+    "VISION_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), "vision_cache.db"),
+)
+
+# Vision agent: draft-mode JPEG decode + NumPy normalise instead of the HF processor
+VISION_FAST_PREPROCESS = os.getenv("VISION_FAST_PREPROCESS", "true").lower() in ("1", "true", "yes")
+
+# Vision agent: upper bounds on images and uncompressed bytes per batch survey upload
+VISION_BATCH_MAX_FILES = int(os.getenv("VISION_BATCH_MAX_FILES", "200"))
+VISION_BATCH_MAX_BYTES = int(os.getenv("VISION_BATCH_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Outbound HTTP: upstream base URLs (override to point at a local stub) and pool tuning
+OPEN_METEO_URL = os.getenv("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+NASA_POWER_URL = os.getenv("NASA_POWER_URL", "https://power.larc.nasa.gov/api/temporal/daily/point")
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Climate agent: weather cache per lat/lon grid cell (Open-Meteo "current" updates every 15 min)
+CLIMATE_GRID_RES = float(os.getenv("CLIMATE_GRID_RES", "0.05"))
+CLIMATE_CACHE_TTL = float(os.getenv("CLIMATE_CACHE_TTL", "900"))
+CLIMATE_CACHE_STALE_TTL = float(os.getenv("CLIMATE_CACHE_STALE_TTL", "3600"))
+CLIMATE_CACHE_SIZE = int(os.getenv("CLIMATE_CACHE_SIZE", "4096"))
+
+# Satellite agent: local store of NASA POWER daily series per grid cell
+SATELLITE_GRID_RES = float(os.getenv("SATELLITE_GRID_RES", "0.1"))
+SATELLITE_STORE_PATH = os.getenv(
+    "SATELLITE_STORE_PATH",
+    os.path.join(os.path.dirname(__file__), "satellite_cache.db"),
+)
+SATELLITE_FINAL_LAG_DAYS = int(os.getenv("SATELLITE_FINAL_LAG_DAYS", "7"))   # days after which values are final
+SATELLITE_SYNC_INTERVAL = float(os.getenv("SATELLITE_SYNC_INTERVAL", "10800"))  # re-check recent days every 3h
+
+# Background prefetch of climate + satellite data for active regions
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", "600"))   # keep below CLIMATE_CACHE_TTL
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "4"))
+PREFETCH_JITTER = float(os.getenv("PREFETCH_JITTER", "0.1"))
+PREFETCH_MAX_BACKOFF = float(os.getenv("PREFETCH_MAX_BACKOFF", "3600"))
+
+# Region risk heatmap: Open-Meteo multi-location batching
+HEATMAP_BATCH_SIZE = int(os.getenv("HEATMAP_BATCH_SIZE", "100"))   # locations per upstream call
+HEATMAP_MAX_CELLS = int(os.getenv("HEATMAP_MAX_CELLS", "2500"))
+HEATMAP_CONCURRENCY = int(os.getenv("HEATMAP_CONCURRENCY", "4"))    # upstream calls in flight per heatmap
+
+# Orchestration: answer unambiguous cases with rules, escalate the rest to the LLM
+ORCHESTRATION_FAST_PATH = os.getenv("ORCHESTRATION_FAST_PATH", "true").lower() in ("1", "true", "yes")
+ORCHESTRATION_CONFIDENCE_GATE = float(os.getenv("ORCHESTRATION_CONFIDENCE_GATE", "75"))   # min consensus to skip the LLM
+
+# Orchestration LLM responses cached by bucketed agent inputs
+ORCHESTRATION_CACHE_SIZE = int(os.getenv("ORCHESTRATION_CACHE_SIZE", "512"))
+ORCHESTRATION_CACHE_TTL = float(os.getenv("ORCHESTRATION_CACHE_TTL", "1800"))
+ORCHESTRATION_CACHE_DISK = os.getenv("ORCHESTRATION_CACHE_DISK", "false").lower() in ("1", "true", "yes")
+ORCHESTRATION_CACHE_PATH = os.getenv(
+    "ORCHESTRATION_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), "orchestration_cache.db"),
+)
+
+# Async LLM client (OpenAI-compatible chat completions at GROQ_BASE_URL)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Database: empty DATABASE_URL → backend/jomee.db (SQLite, WAL mode)
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))          # server databases only
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", "65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Bulk farmer import: rows per executemany batch / transaction
+FARMER_IMPORT_CHUNK_SIZE = int(os.getenv("FARMER_IMPORT_CHUNK_SIZE", "5000"))
+
+# Farmer dashboard: market part shared per (region, commodity), profile rows per farmer
+DASHBOARD_CACHE_SIZE = int(os.getenv("DASHBOARD_CACHE_SIZE", "1024"))
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "3600"))    # also invalidated when region data changes
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "50000"))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "600"))
@@ -1,26 +1,119 @@
 """
-SQLite database via SQLAlchemy (synchronous engine).
+Database access via SQLAlchemy.
 DB file: backend/jomee.db  (auto-created on first run)
+
+Two engines share one DATABASE_URL:
+  - engine / SessionLocal            synchronous, for startup (create_all),
+                                     background threads and CLIs
+  - async_engine / AsyncSessionLocal async (aiosqlite / asyncpg), for request
+                                     handlers via the get_async_session dependency
+
+SQLite connections run in WAL mode with synchronous=NORMAL, a memory-mapped
+read window and a larger page cache, so profile reads do not wait on writes.
+Set DATABASE_URL to a server database (e.g. postgresql://...) to use a
+pooled connection instead.
 """
 import os
-from sqlalchemy import create_engine
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
+from config import (
+    DATABASE_URL as _CONFIGURED_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_KB,
+    SQLITE_BUSY_TIMEOUT_MS,
+)
+
 DB_PATH = os.path.join(os.path.dirname(__file__), "jomee.db")
-DATABASE_URL = f"sqlite:///{DB_PATH}"
+DATABASE_URL = _CONFIGURED_URL or f"sqlite:///{DB_PATH}"
+
+# Async driver for each sync dialect
+_ASYNC_DRIVERS = {
+    "sqlite":     "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql":      "mysql+aiomysql",
+}
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    if "+" in parsed.drivername:
+        backend, _ = parsed.drivername.split("+", 1)
+    else:
+        backend = parsed.drivername
+    driver = _ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.drivername}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+
+
+def _engine_kwargs() -> dict:
+    if IS_SQLITE:
+        return {"connect_args": {"check_same_thread": False}}
+    return {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_pre_ping": True}
+
 
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_KB}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+engine = create_engine(DATABASE_URL, echo=False, **_engine_kwargs())
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
+async_engine = create_async_engine(_async_url(DATABASE_URL), echo=False, **_engine_kwargs())
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
 
 class Base(DeclarativeBase):
     pass
 
 
 def init_db():
-    """Create all tables that don't exist yet."""
+    """Create all tables and indexes that don't exist yet."""
     from models.db_models import FarmerProfile, CropListing, InputListing, BuyerInquiry  # noqa: F401
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes on tables that already exist (e.g. an older jomee.db)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    _backfill_created_at(engine)
+
+
+# Stand-in for rows written before created_at had a default; sorts last, newest first
+LEGACY_CREATED_AT = datetime(1970, 1, 1)
+
+
+def _backfill_created_at(bind):
+    """
+    Older databases can hold NULL created_at in tables the model now declares
+    NOT NULL. The keyset cursor compares on created_at, so give those rows a
+    fixed timestamp instead of letting paging stop at them.
+    """
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            column = table.c.get("created_at")
+            if column is not None and not column.nullable:
+                conn.execute(update(table).where(column.is_(None)).values(created_at=LEGACY_CREATED_AT))
 
 
 def get_session():
@@ -29,3 +122,14 @@ def get_session():
         yield db
     finally:
         db.close()
+
+
+async def get_async_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency: one AsyncSession per request."""
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    await async_engine.dispose()
+    engine.dispose()
@@ -0,0 +1,13 @@
+"""Farmer domain package (profile import, dashboard)."""
+from .farmer_import import import_farmers, profile_columns, detect_format, text_stream
+from .farmer_dashboard import build_farmer_dashboard, invalidate_profile, dashboard_cache_stats
+
+__all__ = [
+    "import_farmers",
+    "profile_columns",
+    "detect_format",
+    "text_stream",
+    "build_farmer_dashboard",
+    "invalidate_profile",
+    "dashboard_cache_stats",
+]
@@ -0,0 +1,88 @@
+"""
+Farmer dashboard assembly with shared per-(region, commodity) results.
+
+Thousands of farmers share a (primary_region, primary_commodity) pair, so the
+market part of the dashboard is computed once per pair and cached under the
+region CSV's (mtime, size) version: updating the region data changes the key
+and the next request recomputes. Profile rows are cached per farmer and
+dropped when the profile is saved. A dashboard hit is a profile lookup and a
+dict merge.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cache import SWRCache, TTLCache
+from config import DASHBOARD_CACHE_SIZE, DASHBOARD_CACHE_TTL, PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL
+from domains.market import get_market_snapshot, region_data_version, to_market_summary
+from models.db_models import FarmerProfile
+
+DEFAULT_REGION = "Kerala_Kottayam"
+DEFAULT_COMMODITY = "Banana"
+
+_PROFILE_FIELDS = ("id", "full_name", "primary_commodity", "primary_region", "land_size", "available_capital")
+
+_pair_cache = SWRCache(ttl=DASHBOARD_CACHE_TTL, maxsize=DASHBOARD_CACHE_SIZE, name="dashboard_pairs")
+_profile_cache = TTLCache(maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL, name="dashboard_profiles")
+
+
+async def _compute_pair(region: str, commodity: str) -> dict:
+    snapshot = await get_market_snapshot(region, commodity, days=14)
+    enriched = snapshot["enriched"]
+    recommendation = snapshot["recommendation"]
+    return {
+        "market": to_market_summary(enriched, recommendation),
+        "ai_recommendation": recommendation.get("action", "HOLD"),
+        "recommendation_reason": recommendation.get("reason", ""),
+        "consensus_score": recommendation.get("confidence", 70),
+        "risk_level": enriched.get("risk_level", "Moderate"),
+    }
+
+
+async def get_pair_dashboard(region: str, commodity: str) -> dict:
+    """Market part of the dashboard for one (region, commodity) pair."""
+    key = (region, commodity, region_data_version(region))
+    return await _pair_cache.get_or_fetch(key, lambda: _compute_pair(region, commodity))
+
+
+async def get_profile_row(db: AsyncSession, farmer_id: str) -> dict | None:
+    row = _profile_cache.get(farmer_id)
+    if row is None:
+        farmer = await db.get(FarmerProfile, farmer_id)
+        if farmer is None:
+            return None
+        row = {field: getattr(farmer, field) for field in _PROFILE_FIELDS}
+        _profile_cache.set(farmer_id, row)
+    return row
+
+
+def invalidate_profile(farmer_id: str) -> None:
+    _profile_cache.pop(farmer_id)
+
+
+async def build_farmer_dashboard(db: AsyncSession, farmer_id: str) -> dict | None:
+    """Dashboard payload for a farmer, or None if the farmer does not exist."""
+    farmer = await get_profile_row(db, farmer_id)
+    if farmer is None:
+        return None
+
+    region = farmer["primary_region"] or DEFAULT_REGION
+    commodity = farmer["primary_commodity"] or DEFAULT_COMMODITY
+    shared = await get_pair_dashboard(region, commodity)
+
+    return {
+        "farmer": {
+            "id": farmer["id"],
+            "full_name": farmer["full_name"],
+            "primary_commodity": commodity,
+            "primary_region": region,
+            "land_size": farmer["land_size"],
+            "available_capital": farmer["available_capital"],
+        },
+        **shared,
+    }
+
+
+def dashboard_cache_stats() -> dict:
+    return {
+        "pairs":    _pair_cache.stats(),
+        "profiles": _profile_cache.stats(),
+    }
@@ -0,0 +1,234 @@
+"""
+Bulk farmer onboarding import.
+
+Accepts CSV (header row of FarmerProfileCreate field names) or NDJSON (one
+FarmerProfileCreate object per line), validates rows as they stream in and
+inserts valid ones with executemany batches, one transaction per chunk.
+Invalid rows are reported with their line number in the file (CSV header and
+blank NDJSON lines included) and never abort the import. A chunk the
+database rejects (e.g. a duplicate id) is reported with its line range and
+the import carries on; a read error mid-file (bad encoding, broken CSV)
+stops it, keeping the chunks already inserted and reporting where it stopped.
+
+CSV list columns (current_crops, interested_crops, technology_interest,
+selling_markets) take either a JSON array or a ";"-separated list.
+
+CLI:
+    python -m domains.farmer.farmer_import farmers.csv
+    python -m domains.farmer.farmer_import farmers.ndjson --dry-run
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import IO, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from models.db_models import FarmerProfile
+from models.farmer_schemas import FarmerProfileCreate
+
+_LIST_FIELDS = {
+    name for name, field in FarmerProfileCreate.model_fields.items()
+    if getattr(field.annotation, "__origin__", None) is list
+}
+_MAX_REPORTED_ERRORS = 1000
+
+
+def profile_columns(profile: FarmerProfileCreate) -> dict:
+    """FarmerProfile column values for a profile completed through onboarding."""
+    return {**profile.model_dump(), "onboarding_completed": True, "profile_completeness": 100.0}
+
+
+def _parse_list(value: str) -> list[str]:
+    value = value.strip()
+    if value.startswith("["):
+        return json.loads(value)
+    return [item.strip() for item in value.split(";") if item.strip()]
+
+
+class ImportReadError(Exception):
+    """The stream itself could not be read from line `row` onwards."""
+
+    def __init__(self, row: int, message: str):
+        super().__init__(message)
+        self.row = row
+
+
+# Row iterators yield (line number, record), where the record is a dict, the
+# ValueError that row raised (so a malformed line is reported without ending
+# the import), or an ImportReadError as the last item when reading fails.
+
+def iter_csv(stream: IO[str]) -> Iterator[tuple[int, dict | Exception]]:
+    reader = csv.DictReader(stream)
+    while True:
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as e:
+            yield reader.line_num + 1, ImportReadError(reader.line_num + 1, str(e))
+            return
+        row = {}
+        try:
+            for key, value in record.items():
+                if key is None or value is None or value.strip() == "":
+                    continue  # empty cell → schema default
+                key = key.strip()
+                row[key] = _parse_list(value) if key in _LIST_FIELDS else value.strip()
+        except ValueError as e:
+            yield reader.line_num, e
+            continue
+        yield reader.line_num, row
+
+
+def iter_ndjson(stream: IO[str]) -> Iterator[tuple[int, dict | Exception]]:
+    lines = iter(stream)
+    line_number = 0
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as e:
+            yield line_number + 1, ImportReadError(line_number + 1, str(e))
+            return
+        line_number += 1
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+def _validated(
+    records: Iterable[tuple[int, dict | Exception]], errors: list[dict], counts: dict,
+) -> Iterator[tuple[int, dict]]:
+    now = datetime.utcnow()
+    for line_number, record in records:
+        if isinstance(record, ImportReadError):
+            raise record
+        try:
+            if isinstance(record, ValueError):
+                raise record
+            profile = FarmerProfileCreate.model_validate(record)
+        except ValueError as e:
+            # ValidationError is a ValueError too
+            counts["invalid"] += 1
+            if len(errors) < _MAX_REPORTED_ERRORS:
+                detail = (
+                    [{"field": ".".join(map(str, err["loc"])), "error": err["msg"]} for err in e.errors()]
+                    if isinstance(e, ValidationError) else [{"field": "", "error": str(e)}]
+                )
+                errors.append({"row": line_number, "errors": detail})
+            continue
+        yield line_number, {
+            "id": str(uuid.uuid4()),
+            **profile_columns(profile),
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def import_farmers(
+    stream: IO[str],
+    fmt: str,
+    engine: Engine,
+    chunk_size: int = 5000,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Import farmer profiles from a text stream ("csv" or "ndjson").
+    Blocking — call through asyncio.to_thread from request handlers.
+
+    The report counts inserted, invalid and failed (rejected by the database)
+    rows; `errors` and `chunk_errors` give their line numbers, and
+    `read_error` the line where reading stopped, if it did.
+    """
+    if fmt not in ("csv", "ndjson"):
+        raise ValueError("format must be 'csv' or 'ndjson'")
+
+    started = time.perf_counter()
+    errors: list[dict] = []
+    chunk_errors: list[dict] = []
+    read_error = None
+    counts = {"inserted": 0, "invalid": 0, "failed": 0, "chunks": 0}
+    records = iter_csv(stream) if fmt == "csv" else iter_ndjson(stream)
+    statement = insert(FarmerProfile.__table__)
+
+    chunk: list[tuple[int, dict]] = []
+
+    def _flush():
+        try:
+            if chunk and not dry_run:
+                with engine.begin() as conn:
+                    conn.execute(statement, [row for _, row in chunk])   # executemany
+        except SQLAlchemyError as e:
+            # The chunk's transaction rolled back; report it and keep going
+            counts["failed"] += len(chunk)
+            chunk_errors.append({"rows": [chunk[0][0], chunk[-1][0]], "error": str(getattr(e, "orig", e))})
+        else:
+            counts["inserted"] += len(chunk)
+        counts["chunks"] += 1
+        chunk.clear()
+
+    try:
+        for line_number, row in _validated(records, errors, counts):
+            chunk.append((line_number, row))
+            if len(chunk) >= chunk_size:
+                _flush()
+    except ImportReadError as e:
+        read_error = {"row": e.row, "error": str(e)}
+    if chunk:
+        _flush()
+
+    return {
+        **counts,
+        "dry_run": dry_run,
+        "seconds": round(time.perf_counter() - started, 3),
+        "errors": errors,
+        "errors_truncated": counts["invalid"] > len(errors),
+        "chunk_errors": chunk_errors,
+        "read_error": read_error,
+    }
+
+
+def detect_format(filename: str, content_type: str | None = None) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or (content_type or "").endswith("ndjson"):
+        return "ndjson"
+    return "csv"
+
+
+def text_stream(binary: IO[bytes]) -> IO[str]:
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
+
+
+if __name__ == "__main__":
+    from database import engine, init_db
+    from config import FARMER_IMPORT_CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(description="Bulk import farmer profiles")
+    parser.add_argument("path", help="CSV or NDJSON file ('-' for stdin)")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="default: from file extension")
+    parser.add_argument("--chunk-size", type=int, default=FARMER_IMPORT_CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="validate only")
+    args = parser.parse_args()
+
+    init_db()
+    fmt = args.format or detect_format(args.path)
+    if args.path == "-":
+        report = import_farmers(sys.stdin, fmt, engine, args.chunk_size, args.dry_run)
+    else:
+        with open(args.path, encoding="utf-8-sig", newline="") as f:
+            report = import_farmers(f, fmt, engine, args.chunk_size, args.dry_run)
+    print(json.dumps(report, indent=2))
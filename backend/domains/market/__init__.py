@@ -5,6 +5,8 @@ from .market_analyze import (
     get_available_filters,
     get_market_records,
     resolve_coords_for_state,
+    region_data_version,
+    encode_json,
 )
 from .market_signals import (
     compute_buyer_signal,
@@ -12,6 +14,7 @@ from .market_signals import (
     compute_trade_recommendation,
     enrich_market_data,
 )
+from .market_snapshot import get_market_snapshot
 from .market_transformers import to_price_card, to_chart_series, to_market_summary
 
 __all__ = [
@@ -20,10 +23,13 @@ __all__ = [
     "get_available_filters",
     "get_market_records",
     "resolve_coords_for_state",
+    "region_data_version",
+    "encode_json",
     "compute_buyer_signal",
     "compute_price_momentum",
     "compute_trade_recommendation",
     "enrich_market_data",
+    "get_market_snapshot",
     "to_price_card",
     "to_chart_series",
     "to_market_summary",
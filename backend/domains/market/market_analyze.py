@@ -8,6 +8,8 @@ CSV Columns: State, District, Market, Commodity, Variety, Grade,
              Arrival_Date, Min_Price, Max_Price, Modal_Price, Commodity_Code
 """
 
+import base64
+import json
 import os
 import glob
 import pandas as pd
@@ -15,6 +17,15 @@ from datetime import datetime, date
 from pathlib import Path
 from functools import lru_cache
 
+from .market_index import CommodityIndex
+from .market_executor import run_coalesced, run_market_task
+from .market_ingest import load_columnar, source_version
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ── CSV file location ──────────────────────────────────────────────────────
 DATA_DIR = Path(__file__).parent.parent.parent / "data"
 
@@ -60,15 +71,50 @@ def resolve_coords_for_state(region_name: str) -> tuple[float, float]:
     return (10.85, 76.27) # Default
 
 
-@lru_cache(maxsize=10)
-def _load_csv(filename: str) -> pd.DataFrame:
+def _load_region(filename: str) -> CommodityIndex:
     """
-    Load and cache a specific CSV file by name.
+    Load and cache the commodity index for a specific CSV file by name.
+    Cache entries are keyed by the file's (mtime, size), so an updated CSV is
+    picked up without a restart.
     """
     path = DATA_DIR / filename
     if not path.exists():
         raise FileNotFoundError(f"Region file {filename} not found")
 
+    return _load_region_version(filename, *source_version(path))
+
+
+def region_data_version(region: str) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a region's CSV, or None if the region has no file."""
+    path = DATA_DIR / f"{region}.csv"
+    try:
+        return source_version(path)
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=10)
+def _load_region_version(filename: str, mtime_ns: int, size: int) -> CommodityIndex:
+    """Load one revision of a region file and build its commodity index."""
+    df = load_columnar(DATA_DIR / filename, _parse_csv, version=(mtime_ns, size))
+    return CommodityIndex(df, COL_COMMODITY, COL_DATE)
+
+
+async def _load_region_async(filename: str) -> CommodityIndex:
+    """
+    Load a region index on the market pool without blocking the event loop.
+    Concurrent cold requests for the same file share a single load.
+    """
+    return await run_coalesced(("region", filename), _load_region, filename)
+
+
+def _load_csv(filename: str) -> pd.DataFrame:
+    """Load a region file as a DataFrame (sorted by commodity, newest first)."""
+    return _load_region(filename).frame
+
+
+def _parse_csv(path: Path) -> pd.DataFrame:
+    """Parse a raw mandi CSV into the normalised, typed layout."""
     df = pd.read_csv(path)
 
     # Strip whitespace from column names
@@ -188,60 +234,9 @@ async def get_market_data(
     """
     try:
         filename = f"{region}.csv"
-        df = _load_csv(filename)
-        
-        # Filter by Commodity
-        if COL_COMMODITY in df.columns:
-            df = df[df[COL_COMMODITY].str.lower() == commodity.lower()]
-
-        if df.empty:
-            return _error_result(region, commodity, "No data for this commodity")
-
-        # Sort by Date descending
-        df = df.sort_values(COL_DATE, ascending=False)
-        
-        latest = df.iloc[0]
-        prev   = df.iloc[1] if len(df) > 1 else None
-
-        modal_price = float(latest.get(COL_MODAL, 0) or 0)
-        min_price   = float(latest.get(COL_MIN,   modal_price) or modal_price)
-        max_price   = float(latest.get(COL_MAX,   modal_price) or modal_price)
-
-        if prev is not None:
-            prev_price   = float(prev.get(COL_MODAL, modal_price) or modal_price)
-            price_change = round(modal_price - prev_price, 2)
-            trend        = "up" if price_change > 0 else ("down" if price_change < 0 else "stable")
-        else:
-            prev_price   = modal_price
-            price_change = 0.0
-            trend        = "stable"
-            
-        arrival_date = latest[COL_DATE]
-        if pd.notna(arrival_date):
-            arrival_date = arrival_date.strftime("%d %b %Y")
-        else:
-            arrival_date = "Unknown"
-
-        return {
-            "commodity":    str(latest.get(COL_COMMODITY, commodity)),
-            "variety":      str(latest.get(COL_VARIETY, "—")),
-            "grade":        str(latest.get(COL_GRADE, "—")),
-            "market_name":  str(latest.get(COL_MARKET, "—")),
-            "district":     str(latest.get(COL_DISTRICT, "—")),
-            "state_name":   str(latest.get(COL_STATE, "—")),
-            "mandi_price":  modal_price,
-            "min_price":    min_price,
-            "max_price":    max_price,
-            "prev_price":   prev_price,
-            "price_change": price_change,
-            "arrival":      0.0,
-            "trend":        trend,
-            "arrival_date": arrival_date,
-            "source":       f"{region}.csv",
-            "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
-            "status":       "success",
-        }
-
+        # Commodity slice, already sorted by date descending
+        df = (await _load_region_async(filename)).slice(commodity)
+        return _summarize_latest(df, region, commodity)
     except Exception as e:
         return _error_result(region, commodity, str(e))
 
@@ -254,96 +249,225 @@ async def get_price_trend_series(
 ) -> list[dict]:
     try:
         filename = f"{region}.csv"
-        df = _load_csv(filename)
-        
-        if COL_COMMODITY in df.columns:
-            df = df[df[COL_COMMODITY].str.lower() == commodity.lower()]
-            
-        if df.empty: return []
-
-        df = df.dropna(subset=[COL_DATE, COL_MODAL])
-        # Group by date, taking median price if multiple markets/varieties exist for same day
-        daily = (
-            df.groupby(COL_DATE)
-              .agg(price=(COL_MODAL, "median"), count=(COL_MODAL, "count"))
-              .reset_index()
-              .sort_values(COL_DATE)
-              .tail(days)
-        )
-        
-        return [
-            {
-                "date":    row[COL_DATE].strftime("%d %b"),
-                "price":   round(float(row["price"]), 2),
-                "arrival": int(row["count"])
-            }
-            for _, row in daily.iterrows()
-        ]
+        df = (await _load_region_async(filename)).slice(commodity)
+        return await run_market_task(_daily_series, df, days)
     except Exception:
         return []
 
 
-def get_market_records(
+def _summarize_latest(df: pd.DataFrame, region: str, commodity: str) -> dict:
+    """Latest-vs-previous price card from a date-descending commodity slice."""
+    if df.empty:
+        return _error_result(region, commodity, "No data for this commodity")
+
+    latest = df.iloc[0]
+    prev   = df.iloc[1] if len(df) > 1 else None
+
+    modal_price = float(latest.get(COL_MODAL, 0) or 0)
+    min_price   = float(latest.get(COL_MIN,   modal_price) or modal_price)
+    max_price   = float(latest.get(COL_MAX,   modal_price) or modal_price)
+
+    if prev is not None:
+        prev_price   = float(prev.get(COL_MODAL, modal_price) or modal_price)
+        price_change = round(modal_price - prev_price, 2)
+        trend        = "up" if price_change > 0 else ("down" if price_change < 0 else "stable")
+    else:
+        prev_price   = modal_price
+        price_change = 0.0
+        trend        = "stable"
+
+    arrival_date = latest[COL_DATE]
+    if pd.notna(arrival_date):
+        arrival_date = arrival_date.strftime("%d %b %Y")
+    else:
+        arrival_date = "Unknown"
+
+    return {
+        "commodity":    str(latest.get(COL_COMMODITY, commodity)),
+        "variety":      str(latest.get(COL_VARIETY, "—")),
+        "grade":        str(latest.get(COL_GRADE, "—")),
+        "market_name":  str(latest.get(COL_MARKET, "—")),
+        "district":     str(latest.get(COL_DISTRICT, "—")),
+        "state_name":   str(latest.get(COL_STATE, "—")),
+        "mandi_price":  modal_price,
+        "min_price":    min_price,
+        "max_price":    max_price,
+        "prev_price":   prev_price,
+        "price_change": price_change,
+        "arrival":      0.0,
+        "trend":        trend,
+        "arrival_date": arrival_date,
+        "source":       f"{region}.csv",
+        "last_updated": datetime.now().strftime("%Y-%m-%d %I:%M %p"),
+        "status":       "success",
+    }
+
+
+def _daily_series(df: pd.DataFrame, days: int) -> list[dict]:
+    """Daily median modal price (oldest→newest) for the last `days` dates."""
+    if df.empty: return []
+
+    df = df.dropna(subset=[COL_DATE, COL_MODAL])
+    # Group by date, taking median price if multiple markets/varieties exist for same day
+    daily = (
+        df.groupby(COL_DATE)
+          .agg(price=(COL_MODAL, "median"), count=(COL_MODAL, "count"))
+          .reset_index()
+          .sort_values(COL_DATE)
+          .tail(days)
+    )
+
+    return [
+        {
+            "date":    row[COL_DATE].strftime("%d %b"),
+            "price":   round(float(row["price"]), 2),
+            "arrival": int(row["count"])
+        }
+        for _, row in daily.iterrows()
+    ]
+
+
+# Record table columns: (field, source column, default when the column is missing)
+_RECORD_TEXT_FIELDS = (
+    ("state",     COL_STATE,     "—"),
+    ("district",  COL_DISTRICT,  "—"),
+    ("market",    COL_MARKET,    "—"),
+    ("commodity", COL_COMMODITY, "—"),
+    ("variety",   COL_VARIETY,   "Other"),
+    ("grade",     COL_GRADE,     "—"),
+)
+_RECORD_PRICE_FIELDS = (
+    ("min_price",   COL_MIN),
+    ("max_price",   COL_MAX),
+    ("modal_price", COL_MODAL),
+)
+RECORD_FIELDS = (
+    *(f for f, _, _ in _RECORD_TEXT_FIELDS), "arrival_date",
+    *(f for f, _ in _RECORD_PRICE_FIELDS), "commodity_code",
+)
+
+
+def _record_columns(df: pd.DataFrame) -> dict[str, list]:
+    """Format rows of a commodity slice column-wise into JSON-ready lists."""
+    n = len(df)
+    columns = {}
+    for field, col, default in _RECORD_TEXT_FIELDS:
+        columns[field] = df[col].astype(str).tolist() if col in df.columns else [default] * n
+
+    if COL_DATE in df.columns:
+        columns["arrival_date"] = df[COL_DATE].dt.strftime("%d/%m/%Y").fillna("—").tolist()
+    else:
+        columns["arrival_date"] = ["—"] * n
+
+    for field, col in _RECORD_PRICE_FIELDS:
+        if col in df.columns:
+            # Missing prices serialise as 0.0, never NaN
+            columns[field] = pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype("float64").tolist()
+        else:
+            columns[field] = [0.0] * n
+
+    code = "Commodity_Code"
+    columns["commodity_code"] = df[code].astype(str).tolist() if code in df.columns else ["—"] * n
+    return {field: columns[field] for field in RECORD_FIELDS}
+
+
+def _record_page(
+    filename: str, mtime_ns: int, size: int, commodity_key: str, offset: int, limit: int,
+) -> tuple[int, dict[str, list]]:
+    """
+    (total rows, record columns for rows offset..offset+limit) for one
+    commodity in one revision of a region file. The commodity slice is a
+    date-descending view of the cached region frame, so only the requested
+    page is formatted and nothing per-slice is held in memory.
+    """
+    df = _load_region_version(filename, mtime_ns, size).slice(commodity_key)
+    return len(df), _record_columns(df.iloc[offset:offset + limit])
+
+
+def encode_records_cursor(version: tuple[int, int], offset: int) -> str:
+    payload = json.dumps({"v": list(version), "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_records_cursor(cursor: str) -> tuple[tuple[int, int], int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded))
+        return (int(data["v"][0]), int(data["v"][1])), int(data["o"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+async def get_market_records(
     region: str,
     commodity: str,
     page: int = 1,
     page_size: int = 50,
+    cursor: str | None = None,
+    layout: str = "records",
 ) -> dict:
     """
     Return paginated individual records from the CSV for a given region+commodity.
-    Each record has: State, District, Market, Commodity, Variety, Grade,
-    Arrival_Date, Min_Price, Max_Price, Modal_Price, Commodity_Code.
+    Each record has: state, district, market, commodity, variety, grade,
+    arrival_date, min_price, max_price, modal_price, commodity_code.
+
+    `cursor` (from a previous page's next_cursor) pins the data revision, so
+    paging stays stable; it raises ValueError once the region file changes.
+    layout="columnar" returns {"columns": {field: [...]}} instead of records.
     """
+    if layout not in ("records", "columnar"):
+        raise ValueError("layout must be 'records' or 'columnar'")
+    cursor_version, offset = decode_records_cursor(cursor) if cursor else (None, (page - 1) * page_size)
+
     try:
         filename = f"{region}.csv"
-        df = _load_csv(filename)
-
-        if COL_COMMODITY in df.columns:
-            df = df[df[COL_COMMODITY].str.lower() == commodity.lower()]
+        await _load_region_async(filename)
+        version = region_data_version(region)
+        if version is None:
+            raise FileNotFoundError(f"Region file {filename} not found")
+        if cursor_version is not None and cursor_version != version:
+            raise ValueError("Cursor expired: region data has changed, restart from the first page")
+        total, columns = await run_market_task(
+            _record_page, filename, *version, commodity.lower(), offset, page_size,
+        )
+    except ValueError:
+        raise
+    except Exception as e:
+        return {"records": [], "total": 0, "page": page, "page_size": page_size, "error": str(e)}
 
-        if df.empty:
-            return {"records": [], "total": 0, "page": page, "page_size": page_size}
+    return _records_page(total, columns, version, offset, page_size, layout)
 
-        # Sort by date descending (most recent first)
-        df = df.sort_values(COL_DATE, ascending=False)
 
-        total = len(df)
+def _records_page(
+    total: int,
+    page_columns: dict[str, list],
+    version: tuple[int, int],
+    offset: int,
+    page_size: int,
+    layout: str = "records",
+) -> dict:
+    """Response for one page of record columns from _record_page."""
+    end = min(offset + page_size, total)
+    result = {
+        "total": total,
+        "page": offset // page_size + 1,
+        "page_size": page_size,
+        "next_cursor": encode_records_cursor(version, end) if end < total else None,
+    }
+    if layout == "columnar":
+        result["columns"] = page_columns
+    else:
+        result["records"] = [
+            dict(zip(RECORD_FIELDS, row)) for row in zip(*(page_columns[f] for f in RECORD_FIELDS))
+        ]
+    return result
 
-        # Paginate
-        start = (page - 1) * page_size
-        end = start + page_size
-        page_df = df.iloc[start:end]
 
-        records = []
-        for _, row in page_df.iterrows():
-            arrival_date = row.get(COL_DATE)
-            if pd.notna(arrival_date):
-                arrival_date = arrival_date.strftime("%d/%m/%Y")
-            else:
-                arrival_date = "—"
-
-            records.append({
-                "state": str(row.get(COL_STATE, "—")),
-                "district": str(row.get(COL_DISTRICT, "—")),
-                "market": str(row.get(COL_MARKET, "—")),
-                "commodity": str(row.get(COL_COMMODITY, "—")),
-                "variety": str(row.get(COL_VARIETY, "Other")),
-                "grade": str(row.get(COL_GRADE, "—")),
-                "arrival_date": arrival_date,
-                "min_price": float(row.get(COL_MIN, 0) or 0),
-                "max_price": float(row.get(COL_MAX, 0) or 0),
-                "modal_price": float(row.get(COL_MODAL, 0) or 0),
-                "commodity_code": str(row.get("Commodity_Code", "—")),
-            })
-
-        return {
-            "records": records,
-            "total": total,
-            "page": page,
-            "page_size": page_size,
-        }
-    except Exception as e:
-        return {"records": [], "total": 0, "page": page, "page_size": page_size, "error": str(e)}
+def encode_json(payload) -> bytes:
+    """Serialise a response payload to bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
 
 
 def _error_result(region: str, commodity: str, reason: str) -> dict:
@@ -0,0 +1,57 @@
+"""
+Market Executor — Domain Layer
+Bounded thread pool that keeps blocking pandas work (CSV/Arrow loading,
+groupby aggregations) off the uvicorn event loop.
+
+Identical concurrent jobs are coalesced: while a job for a given key is in
+flight, later callers await the same future instead of starting their own,
+so N cold requests for one region trigger a single load.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Hashable
+
+from config import MARKET_EXECUTOR_WORKERS
+
+_executor: ThreadPoolExecutor | None = None
+_inflight: dict[Hashable, asyncio.Future] = {}
+
+
+def get_market_executor() -> ThreadPoolExecutor:
+    """Return the shared market pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=MARKET_EXECUTOR_WORKERS,
+            thread_name_prefix="market",
+        )
+    return _executor
+
+
+def shutdown_market_executor() -> None:
+    """Stop the pool (called from the FastAPI lifespan on shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_market_task(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking callable on the market pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_market_executor(), partial(fn, *args, **kwargs))
+
+
+async def run_coalesced(key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Like run_market_task, but concurrent calls sharing `key` share one execution.
+    A cancelled waiter does not cancel the underlying job for the others.
+    """
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(run_market_task(fn, *args, **kwargs))
+        _inflight[key] = future
+        future.add_done_callback(lambda _f, k=key: _inflight.pop(k, None))
+    return await asyncio.shield(future)
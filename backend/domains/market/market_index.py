@@ -0,0 +1,55 @@
+"""
+Market Index — Domain Layer
+Pre-built per-commodity index over one region DataFrame.
+
+Rows are sorted once at load time by (lower-cased commodity, date descending)
+and the row range of every commodity is recorded, so a commodity lookup is a
+dict hit plus an `iloc` slice instead of a full-column lowercase + scan + sort.
+"""
+
+import numpy as np
+import pandas as pd
+
+_KEY = "__commodity_key"
+
+
+class CommodityIndex:
+    """Commodity-partitioned, date-descending view over a region DataFrame."""
+
+    def __init__(self, df: pd.DataFrame, commodity_col: str, date_col: str):
+        self.commodity_col = commodity_col
+        self.date_col = date_col
+        self.ranges: dict[str, tuple[int, int]] = {}
+
+        if commodity_col not in df.columns:
+            # No commodity column — every lookup returns the whole file
+            self.frame = df.sort_values(date_col, ascending=False).reset_index(drop=True)
+            return
+
+        keys = df[commodity_col].astype(str).str.lower()
+        ordered = (
+            df.assign(**{_KEY: keys})
+              .sort_values([_KEY, date_col], ascending=[True, False], na_position="last")
+              .reset_index(drop=True)
+        )
+        sorted_keys = ordered[_KEY].to_numpy()
+
+        self.frame = ordered.drop(columns=_KEY)
+        self.frame[commodity_col] = self.frame[commodity_col].astype("category")
+
+        if len(sorted_keys):
+            starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+            ends   = np.r_[starts[1:], len(sorted_keys)]
+            self.ranges = {
+                sorted_keys[s]: (int(s), int(e)) for s, e in zip(starts, ends)
+            }
+
+    def slice(self, commodity: str) -> pd.DataFrame:
+        """Rows for `commodity` (case-insensitive), most recent first."""
+        if self.commodity_col not in self.frame.columns:
+            return self.frame
+        bounds = self.ranges.get(commodity.lower())
+        if bounds is None:
+            return self.frame.iloc[0:0]
+        start, end = bounds
+        return self.frame.iloc[start:end]
@@ -0,0 +1,88 @@
+"""
+Market Ingest — Columnar Cache (Domain Layer)
+Converts each regional CSV once into a typed, normalised Arrow IPC (Feather v2)
+file stored next to the source under backend/data/.columnar/.
+
+Cache files are keyed by the source file's mtime and size, so editing or
+re-uploading a CSV transparently triggers a fresh ingest. Later loads read the
+columnar file memory-mapped instead of re-parsing the CSV.
+Falls back to plain CSV parsing when pyarrow is not installed.
+"""
+
+import os
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is optional — CSV parsing still works without it
+    feather = None
+
+# Bump when the normalisation in market_analyze changes so stale caches are ignored
+INGEST_VERSION = 1
+
+CACHE_DIRNAME = ".columnar"
+
+
+def source_version(path: Path) -> tuple[int, int]:
+    """Return the (mtime_ns, size) pair that identifies one revision of a CSV."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _cache_path(path: Path, version: tuple[int, int]) -> Path:
+    mtime_ns, size = version
+    name = f"{path.stem}.v{INGEST_VERSION}.{mtime_ns}.{size}.arrow"
+    return path.parent / CACHE_DIRNAME / name
+
+
+def _remove_stale(path: Path, keep: Path) -> None:
+    """Delete older cache files for the same source CSV."""
+    for old in keep.parent.glob(f"{path.stem}.v*.arrow"):
+        if old != keep:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def load_columnar(
+    path: Path,
+    parse: Callable[[Path], pd.DataFrame],
+    version: tuple[int, int] | None = None,
+) -> pd.DataFrame:
+    """
+    Load a normalised DataFrame for `path`, using the columnar cache when fresh.
+
+    `parse` is the CSV → normalised DataFrame function; it only runs on a cache
+    miss, and its result is written back as an uncompressed Arrow IPC file so
+    subsequent loads can be memory-mapped.
+    """
+    if feather is None:
+        return parse(path)
+
+    version = version or source_version(path)
+    cached = _cache_path(path, version)
+
+    if cached.exists():
+        try:
+            return feather.read_table(cached, memory_map=True).to_pandas()
+        except Exception as e:
+            print(f"Columnar cache unreadable, re-ingesting {path.name}: {e}")
+
+    df = parse(path)
+
+    tmp = cached.with_suffix(f".tmp{os.getpid()}")
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+        os.replace(tmp, cached)
+        _remove_stale(path, cached)
+    except Exception as e:
+        # Mixed-type object columns etc. — serve the parsed frame uncached
+        print(f"Columnar ingest skipped for {path.name}: {e}")
+        tmp.unlink(missing_ok=True)
+
+    return df
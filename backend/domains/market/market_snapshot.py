@@ -0,0 +1,80 @@
+"""
+Market Snapshot — Domain Layer
+One shared query plan for everything the dashboards need about a
+(region, commodity) pair: latest + previous row, daily median series,
+momentum and the trade recommendation, all computed from a single
+commodity slice.
+"""
+
+import pandas as pd
+
+from .market_analyze import (
+    _load_region_async,
+    _summarize_latest,
+    _daily_series,
+    _error_result,
+)
+from .market_executor import run_market_task
+from .market_signals import compute_price_momentum, compute_trade_recommendation, enrich_market_data
+
+
+async def get_market_snapshot(region: str, commodity: str, days: int = 14) -> dict:
+    """
+    Market snapshot with the region load and aggregations run on the market
+    pool, so a cold CSV never blocks the event loop.
+    """
+    try:
+        df = (await _load_region_async(f"{region}.csv")).slice(commodity)
+    except Exception as e:
+        return _snapshot_from_slice(None, region, commodity, days, error=str(e))
+    return await run_market_task(_snapshot_from_slice, df, region, commodity, days)
+
+
+def _snapshot_from_slice(
+    df: pd.DataFrame | None,
+    region: str,
+    commodity: str,
+    days: int,
+    error: str = "",
+) -> dict:
+    """
+    Build the market snapshot for one (region, commodity) pair.
+
+    Returns:
+      {
+        "raw":            get_market_data-shaped dict,
+        "series":         get_price_trend_series-shaped list,
+        "enriched":       raw + buyer_signal + momentum,
+        "momentum":       compute_price_momentum(series),
+        "recommendation": compute_trade_recommendation(...),
+      }
+    """
+    if df is None:
+        raw, series = _error_result(region, commodity, error), []
+    else:
+        try:
+            raw = _summarize_latest(df, region, commodity)
+        except Exception as e:
+            raw = _error_result(region, commodity, str(e))
+        try:
+            series = _daily_series(df, days)
+        except Exception:
+            series = []
+
+    momentum = compute_price_momentum(series)
+    enriched = enrich_market_data(raw)
+    enriched["momentum"] = momentum
+
+    recommendation = compute_trade_recommendation(
+        trend        = enriched.get("trend", "stable"),
+        buyer_signal = enriched.get("buyer_signal", "Stable"),
+        momentum     = momentum.get("momentum", "neutral"),
+    )
+
+    return {
+        "raw":            raw,
+        "series":         series,
+        "enriched":       enriched,
+        "momentum":       momentum,
+        "recommendation": recommendation,
+    }
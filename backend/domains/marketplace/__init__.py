@@ -0,0 +1,12 @@
+"""Marketplace domain package (crop/input listings and buyer inquiries)."""
+from .marketplace_search import (
+    search_crop_listings,
+    search_input_listings,
+    search_inquiries,
+)
+
+__all__ = [
+    "search_crop_listings",
+    "search_input_listings",
+    "search_inquiries",
+]
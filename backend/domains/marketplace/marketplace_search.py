@@ -0,0 +1,125 @@
+"""
+Marketplace search over crop listings, input listings and buyer inquiries.
+
+Results are ordered newest first by (created_at, id) and paged with an opaque
+keyset cursor instead of OFFSET, so page N costs the same index range scan as
+page 1. Filters are equality predicates that match the composite indexes in
+models/db_models.py (filter columns first, then created_at, id). created_at
+is NOT NULL on these tables; init_db backfills legacy NULLs so the cursor
+comparison never hits one.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import and_, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.db_models import CropListing, InputListing, BuyerInquiry
+
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _row_dict(obj) -> dict:
+    row = {c.key: getattr(obj, c.key) for c in inspect(obj).mapper.column_attrs}
+    if isinstance(row.get("created_at"), datetime):
+        row["created_at"] = row["created_at"].isoformat()
+    return row
+
+
+async def _keyset_page(
+    db: AsyncSession,
+    model,
+    filters: list,
+    limit: int,
+    cursor: str | None,
+) -> dict:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = select(model).where(*filters)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        ))
+    # One extra row tells us whether another page exists
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+    rows = (await db.execute(query)).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if has_more and rows else None
+
+    return {
+        "items":       [_row_dict(r) for r in rows],
+        "count":       len(rows),
+        "next_cursor": next_cursor,
+    }
+
+
+async def search_crop_listings(
+    db: AsyncSession,
+    crop_name: str | None = None,
+    district: str | None = None,
+    farmer_id: str | None = None,
+    status: str | None = "active",
+    limit: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    filters = []
+    if farmer_id:
+        filters.append(CropListing.farmer_id == farmer_id)
+    if status:
+        filters.append(CropListing.status == status)
+    if crop_name:
+        filters.append(CropListing.crop_name == crop_name)
+    if district:
+        filters.append(CropListing.district == district)
+    return await _keyset_page(db, CropListing, filters, limit, cursor)
+
+
+async def search_input_listings(
+    db: AsyncSession,
+    category: str | None = None,
+    farmer_id: str | None = None,
+    status: str | None = "available",
+    limit: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    filters = []
+    if farmer_id:
+        filters.append(InputListing.farmer_id == farmer_id)
+    if status:
+        filters.append(InputListing.status == status)
+    if category:
+        filters.append(InputListing.category == category)
+    return await _keyset_page(db, InputListing, filters, limit, cursor)
+
+
+async def search_inquiries(
+    db: AsyncSession,
+    listing_id: str | None = None,
+    status: str | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    filters = []
+    if listing_id:
+        filters.append(BuyerInquiry.listing_id == listing_id)
+    if status:
+        filters.append(BuyerInquiry.status == status)
+    return await _keyset_page(db, BuyerInquiry, filters, limit, cursor)
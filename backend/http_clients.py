@@ -0,0 +1,87 @@
+"""
+Shared outbound HTTP clients.
+
+One pooled httpx.AsyncClient per upstream (Open-Meteo, NASA POWER, Groq),
+created in the FastAPI lifespan and reused by every agent, so calls ride
+keep-alive connections (HTTP/2 where the server and `h2` support it)
+instead of paying a TCP+TLS handshake per request.
+
+Upstream base URLs come from config.py, so the agents can be pointed at a
+local stub server for testing.
+"""
+import httpx
+
+from config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP2_ENABLED,
+)
+
+try:
+    import h2  # noqa: F401 — httpx needs it for http2=True
+    _HTTP2 = HTTP2_ENABLED
+except ImportError:
+    _HTTP2 = False
+
+# Per-upstream read/total timeouts (seconds)
+UPSTREAM_TIMEOUTS = {
+    "open_meteo": 15.0,
+    "nasa_power": 30.0,
+    "groq":       30.0,
+}
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_stats: dict[str, dict[str, int]] = {}
+
+# Replaces the pooled network transport when set (tests use httpx.MockTransport)
+_transport: httpx.AsyncBaseTransport | None = None
+
+
+def _make_client(name: str) -> httpx.AsyncClient:
+    stats = _stats.setdefault(name, {"requests": 0, "errors": 0})
+
+    async def _count_request(request):
+        stats["requests"] += 1
+
+    async def _count_response(response):
+        if response.status_code >= 400:
+            stats["errors"] += 1
+
+    return httpx.AsyncClient(
+        http2=_HTTP2,
+        timeout=httpx.Timeout(UPSTREAM_TIMEOUTS.get(name, 30.0), connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+        event_hooks={"request": [_count_request], "response": [_count_response]},
+        transport=_transport,
+    )
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """Return the pooled client for an upstream, creating it lazily if needed."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _make_client(name)
+    return client
+
+
+async def start_http_clients() -> None:
+    """Create every upstream client up front (called from lifespan)."""
+    for name in UPSTREAM_TIMEOUTS:
+        get_client(name)
+
+
+async def close_http_clients() -> None:
+    """Close all pooled connections (called from lifespan on shutdown)."""
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+
+
+def http_client_stats() -> dict:
+    return {"http2": _HTTP2, "upstreams": {name: dict(s) for name, s in _stats.items()}}
@@ -0,0 +1,180 @@
+"""
+Async LLM client for OpenAI-compatible chat completions (Groq by default).
+
+Requests go through the pooled "groq" httpx client from http_clients.py, so
+orchestration never blocks the event loop. Each call has its own timeout,
+retries transient failures (connection errors, 408/409/429/5xx) with
+exponential backoff + jitter, honouring Retry-After, and a semaphore caps
+concurrent completions per worker.
+
+`stream_chat_completion` yields content deltas as they arrive (SSE from the
+upstream); retries only apply before the first token.
+
+Point GROQ_BASE_URL at a local fake OpenAI-compatible server to test.
+"""
+import asyncio
+import json
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+from config import (
+    GROQ_API_KEY,
+    GROQ_BASE_URL,
+    GROQ_MODEL,
+    LLM_TIMEOUT,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE,
+    LLM_MAX_CONCURRENCY,
+)
+from http_clients import get_client
+
+_RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_semaphore: asyncio.Semaphore | None = None
+_stats = {"calls": 0, "retries": 0, "failures": 0, "waiting": 0}
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(max(1, LLM_MAX_CONCURRENCY))
+    return _semaphore
+
+
+@asynccontextmanager
+async def _slot():
+    """Hold one of the LLM_MAX_CONCURRENCY slots; `waiting` counts callers queued for one."""
+    semaphore = _get_semaphore()
+    _stats["waiting"] += 1
+    try:
+        await semaphore.acquire()
+    finally:
+        _stats["waiting"] -= 1
+    try:
+        _stats["calls"] += 1
+        yield
+    finally:
+        semaphore.release()
+
+
+def _backoff(attempt: int, response: httpx.Response | None) -> float:
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        try:
+            return min(float(retry_after), 30.0)
+        except (TypeError, ValueError):
+            pass
+    return LLM_BACKOFF_BASE * 2 ** attempt * random.uniform(0.5, 1.5)
+
+
+def _payload(messages, temperature, max_tokens, json_mode, model, stream=False) -> dict:
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    if stream:
+        payload["stream"] = True
+    return payload
+
+
+async def _retrying(attempt_fn):
+    """Run `attempt_fn()` (which returns a response or raises) with retries."""
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        response = None
+        try:
+            response = await attempt_fn()
+            if response.status_code not in _RETRY_STATUS:
+                response.raise_for_status()
+                return response
+            error = httpx.HTTPStatusError(
+                f"LLM returned {response.status_code}", request=response.request, response=response,
+            )
+        except httpx.TransportError as e:
+            error = e
+        except httpx.HTTPStatusError:
+            _stats["failures"] += 1
+            raise
+
+        if attempt == LLM_MAX_RETRIES:
+            _stats["failures"] += 1
+            raise error
+        _stats["retries"] += 1
+        await asyncio.sleep(_backoff(attempt, response))
+
+
+def _headers() -> dict:
+    if not GROQ_API_KEY:
+        raise ValueError("GROQ_API_KEY is not set. Please add it to your .env file.")
+    return {"Authorization": f"Bearer {GROQ_API_KEY}"}
+
+
+async def chat_completion(
+    messages: list[dict],
+    temperature: float = 0.3,
+    max_tokens: int = 1024,
+    json_mode: bool = False,
+    model: str = GROQ_MODEL,
+) -> str:
+    """
+    Return the assistant message content for `messages`.
+    Raises httpx.HTTPStatusError for non-retryable (or exhausted) HTTP errors.
+    """
+    headers = _headers()
+    payload = _payload(messages, temperature, max_tokens, json_mode, model)
+
+    async with _slot():
+        response = await _retrying(lambda: get_client("groq").post(
+            f"{GROQ_BASE_URL}/chat/completions", headers=headers, json=payload, timeout=LLM_TIMEOUT,
+        ))
+        return response.json()["choices"][0]["message"]["content"]
+
+
+async def stream_chat_completion(
+    messages: list[dict],
+    temperature: float = 0.3,
+    max_tokens: int = 1024,
+    json_mode: bool = False,
+    model: str = GROQ_MODEL,
+) -> AsyncIterator[str]:
+    """Yield content deltas of a streamed chat completion as they arrive."""
+    headers = _headers()
+    payload = _payload(messages, temperature, max_tokens, json_mode, model, stream=True)
+    client = get_client("groq")
+
+    async def _open():
+        request = client.build_request(
+            "POST", f"{GROQ_BASE_URL}/chat/completions",
+            headers=headers, json=payload, timeout=LLM_TIMEOUT,
+        )
+        response = await client.send(request, stream=True)
+        if response.status_code >= 400:
+            await response.aread()
+            await response.aclose()
+        return response
+
+    async with _slot():
+        response = await _retrying(_open)
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+        finally:
+            await response.aclose()
+
+
+def llm_client_stats() -> dict:
+    return {"max_concurrency": LLM_MAX_CONCURRENCY, **_stats}
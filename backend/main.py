@@ -3,46 +3,111 @@ Multi-Agent Disease Intelligence Platform — FastAPI Backend
 
 Endpoints:
   POST /api/vision/analyze          — Image upload → HF disease classification
+  POST /api/vision/analyze/batch    — Many images / zip → streamed NDJSON + plot summary
+  GET  /api/vision/metrics          — Vision batching + result-cache metrics
   GET  /api/climate/risk            — Weather data → outbreak risk scoring
+  GET  /api/climate/risk-curve      — Hourly outbreak risk over the forecast horizon
+  GET  /api/climate/heatmap         — Outbreak risk grid over a bounding box
   GET  /api/satellite/health        — Vegetation health index
-  POST /api/orchestrate             — Multi-agent synthesis via Groq LLM
+  POST /api/orchestrate             — Multi-agent synthesis (rules fast path, Groq LLM fallback; ?stream=true for SSE)
+  POST /api/assistant/chat          — Farming assistant chat (?stream=true for SSE)
   GET  /api/market/intelligence     — Mandi price + signals + recommendation
   POST /api/farmer/profile          — Save farmer profile from onboarding
+  POST /api/farmer/import           — Bulk import profiles (CSV / NDJSON)
   GET  /api/farmer/profile/{id}     — Get farmer profile
   GET  /api/farmer/dashboard/{id}   — Dashboard data using farmer prefs
+  GET  /api/marketplace/crops       — Crop listing search (cursor paging)
+  GET  /api/marketplace/inputs      — Input listing search (cursor paging)
+  GET  /api/marketplace/inquiries   — Buyer inquiry search (cursor paging)
+  GET  /api/cache/stats             — Cache hit ratios
   GET  /api/health                  — Health check
 """
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from datetime import datetime
-from database import init_db, SessionLocal
+import io
+import json
+import zipfile
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import init_db, engine, get_async_session, dispose_engines
 from models.db_models import FarmerProfile
 from models.farmer_schemas import FarmerProfileCreate, FarmerProfileResponse
 
-from agents.vision_agent import analyze_image
-from agents.climate_agent import get_climate_risk
+from agents.vision_agent import analyze_image, analyze_images, get_batcher, get_result_cache, preload_weights, warm_up
+from agents.climate_agent import get_climate_risk, get_climate_cache, get_outbreak_curve, get_forecast_cache, get_risk_heatmap
 from agents.satellite_agent import get_satellite_health
-from agents.orchestrator import run_orchestration
-from agents.outlier_orchestrator import run_orchestration
+from agents.orchestrator import run_orchestration, stream_orchestration, get_response_cache
 from domains.market import (
     get_market_data,
-    get_price_trend_series,
     get_available_filters,
     get_market_records,
-    enrich_market_data,
-    compute_trade_recommendation,
+    encode_json,
+    get_market_snapshot,
     to_market_summary,
     to_chart_series,
     resolve_coords_for_state,
 )
+from domains.market.market_executor import run_coalesced, shutdown_market_executor
+from domains.farmer import (
+    import_farmers,
+    profile_columns,
+    detect_format,
+    text_stream,
+    build_farmer_dashboard,
+    invalidate_profile,
+    dashboard_cache_stats,
+)
+from domains.marketplace import search_crop_listings, search_input_listings, search_inquiries
 from models.schemas import AgentInput
+from config import (
+    VISION_WARMUP,
+    VISION_PRELOAD,
+    VISION_BATCH_MAX_FILES,
+    VISION_BATCH_MAX_BYTES,
+    PREFETCH_ENABLED,
+    PREFETCH_INTERVAL,
+    PREFETCH_CONCURRENCY,
+    PREFETCH_JITTER,
+    PREFETCH_MAX_BACKOFF,
+    FARMER_IMPORT_CHUNK_SIZE,
+)
+from agents.prefetch import PrefetchScheduler
+from http_clients import start_http_clients, close_http_clients, http_client_stats
+from llm_client import chat_completion, stream_chat_completion, llm_client_stats
+import asyncio
+
+# Load vision weights at import time so a pre-forking server
+# (gunicorn --preload) shares them copy-on-write across workers.
+if VISION_PRELOAD:
+    preload_weights()
+
+prefetcher = PrefetchScheduler(
+    interval=PREFETCH_INTERVAL,
+    concurrency=PREFETCH_CONCURRENCY,
+    jitter=PREFETCH_JITTER,
+    max_backoff=PREFETCH_MAX_BACKOFF,
+)
 
 @asynccontextmanager
 async def lifespan(app):
     init_db()
+    await start_http_clients()
+    if VISION_WARMUP:
+        try:
+            await asyncio.to_thread(warm_up)
+        except Exception as e:
+            print(f"Vision warm-up failed: {e}")
+    if PREFETCH_ENABLED:
+        prefetcher.start()
     yield
+    await prefetcher.stop()
+    await get_batcher().stop()
+    await close_http_clients()
+    shutdown_market_executor()
+    await dispose_engines()
 
 app = FastAPI(
     title="Disease Intelligence Platform API",
@@ -68,67 +133,66 @@ async def health():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "agents": ["vision", "climate", "satellite", "orchestrator"],
+        "http_clients": http_client_stats(),
+        "llm_client": llm_client_stats(),
+    }
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit ratios and sizes of the in-process caches."""
+    return {
+        "climate":  get_climate_cache().stats(),
+        "forecast": get_forecast_cache().stats(),
+        "orchestration": get_response_cache().stats(),
+        "dashboard": dashboard_cache_stats(),
+        "prefetch": prefetcher.stats(),
     }
 
 
 # ── Farmer Profile ──
 @app.post("/api/farmer/profile")
-async def save_farmer_profile(profile: FarmerProfileCreate):
+async def save_farmer_profile(
+    profile: FarmerProfileCreate,
+    db: AsyncSession = Depends(get_async_session),
+):
     """Save or create a farmer profile from onboarding data."""
     try:
-        db = SessionLocal()
-        try:
-            farmer = FarmerProfile(
-                farmer_type=profile.farmer_type,
-                full_name=profile.full_name,
-                mobile=profile.mobile,
-                location=profile.location,
-                district=profile.district,
-                state=profile.state,
-                land_size=profile.land_size,
-                soil_type=profile.soil_type,
-                available_capital=profile.available_capital,
-                has_loan_access=profile.has_loan_access,
-                has_subsidy_access=profile.has_subsidy_access,
-                has_irrigation=profile.has_irrigation,
-                irrigation_type=profile.irrigation_type,
-                has_storage=profile.has_storage,
-                storage_capacity_tons=profile.storage_capacity_tons,
-                current_crops=profile.current_crops,
-                interested_crops=profile.interested_crops,
-                technology_interest=profile.technology_interest,
-                yearly_yield_tons=profile.yearly_yield_tons,
-                selling_markets=profile.selling_markets,
-                primary_commodity=profile.primary_commodity,
-                primary_region=profile.primary_region,
-                time_commitment=profile.time_commitment,
-                no_land_option=profile.no_land_option,
-                has_land=profile.has_land,
-                onboarding_completed=True,
-                profile_completeness=100.0,
-            )
-            db.add(farmer)
-            db.commit()
-            db.refresh(farmer)
-            return {"id": farmer.id, "status": "created"}
-        finally:
-            db.close()
+        farmer = FarmerProfile(**profile_columns(profile))
+        db.add(farmer)
+        await db.commit()
+        invalidate_profile(farmer.id)
+        return {"id": farmer.id, "status": "created"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Profile save failed: {str(e)}")
 
 
+@app.post("/api/farmer/import")
+async def import_farmer_profiles(
+    file: UploadFile = File(..., description="CSV or NDJSON of farmer profiles"),
+    fmt: str | None = Query(None, alias="format", description="csv | ndjson (default: from filename)"),
+    dry_run: bool = Query(False, description="Validate only, insert nothing"),
+):
+    """Bulk-import farmer profiles with batched inserts; reports per-row errors."""
+    fmt = fmt or detect_format(file.filename, file.content_type)
+    try:
+        return await asyncio.to_thread(
+            import_farmers, text_stream(file.file), fmt, engine, FARMER_IMPORT_CHUNK_SIZE, dry_run,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Farmer import failed: {str(e)}")
+
+
 @app.get("/api/farmer/profile/{farmer_id}")
-async def get_farmer_profile(farmer_id: str):
+async def get_farmer_profile(farmer_id: str, db: AsyncSession = Depends(get_async_session)):
     """Get a farmer profile by ID."""
     try:
-        db = SessionLocal()
-        try:
-            farmer = db.query(FarmerProfile).filter(FarmerProfile.id == farmer_id).first()
-            if not farmer:
-                raise HTTPException(status_code=404, detail="Farmer not found")
-            return FarmerProfileResponse.model_validate(farmer)
-        finally:
-            db.close()
+        farmer = await db.get(FarmerProfile, farmer_id)
+        if not farmer:
+            raise HTTPException(status_code=404, detail="Farmer not found")
+        return FarmerProfileResponse.model_validate(farmer)
     except HTTPException:
         raise
     except Exception as e:
@@ -136,62 +200,71 @@ async def get_farmer_profile(farmer_id: str):
 
 
 @app.get("/api/farmer/dashboard/{farmer_id}")
-async def farmer_dashboard(farmer_id: str):
+async def farmer_dashboard(farmer_id: str, db: AsyncSession = Depends(get_async_session)):
     """
     Dashboard data using the farmer's saved commodity and region preferences.
     Returns market intelligence tailored to the farmer's onboarding choices.
     """
     try:
-        # 1. Load farmer profile
-        db = SessionLocal()
-        try:
-            farmer = db.query(FarmerProfile).filter(FarmerProfile.id == farmer_id).first()
-            if not farmer:
-                raise HTTPException(status_code=404, detail="Farmer not found")
-        finally:
-            db.close()
-
-        # 2. Use farmer preferences to query market data
-        region = farmer.primary_region or "Kerala_Kottayam"
-        commodity = farmer.primary_commodity or "Banana"
-
-        import asyncio
-        raw, series = await asyncio.gather(
-            get_market_data(region, commodity),
-            get_price_trend_series(region, commodity, days=14),
-        )
-        from domains.market.market_signals import compute_price_momentum
-        enriched = enrich_market_data(raw, series)
-        momentum = compute_price_momentum(series)
-        enriched["momentum"] = momentum
-        recommendation = compute_trade_recommendation(
-            trend=enriched.get("trend", "stable"),
-            buyer_signal=enriched.get("buyer_signal", "Stable"),
-            momentum=momentum.get("momentum", "neutral"),
-        )
-        summary = to_market_summary(enriched, recommendation)
-
-        return {
-            "farmer": {
-                "id": farmer.id,
-                "full_name": farmer.full_name,
-                "primary_commodity": commodity,
-                "primary_region": region,
-                "land_size": farmer.land_size,
-                "available_capital": farmer.available_capital,
-            },
-            "market": summary,
-            "ai_recommendation": recommendation.get("action", "HOLD"),
-            "recommendation_reason": recommendation.get("reason", ""),
-            "consensus_score": recommendation.get("confidence", 70),
-            "risk_level": enriched.get("risk_level", "Moderate"),
-        }
+        dashboard = await build_farmer_dashboard(db, farmer_id)
+        if dashboard is None:
+            raise HTTPException(status_code=404, detail="Farmer not found")
+        return dashboard
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Dashboard data failed: {str(e)}")
 
 
+# ── Marketplace Search (keyset pagination) ──
+@app.get("/api/marketplace/crops")
+async def marketplace_crops(
+    crop_name: str | None = Query(None),
+    district: str | None = Query(None),
+    farmer_id: str | None = Query(None),
+    status: str | None = Query("active"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Crop listings, newest first, with cursor paging."""
+    try:
+        return await search_crop_listings(db, crop_name, district, farmer_id, status, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/marketplace/inputs")
+async def marketplace_inputs(
+    category: str | None = Query(None),
+    farmer_id: str | None = Query(None),
+    status: str | None = Query("available"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Input (agri-product) listings, newest first, with cursor paging."""
+    try:
+        return await search_input_listings(db, category, farmer_id, status, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/marketplace/inquiries")
+async def marketplace_inquiries(
+    listing_id: str | None = Query(None),
+    status: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Buyer inquiries, newest first, with cursor paging."""
+    try:
+        return await search_inquiries(db, listing_id, status, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ── Vision Detection Agent ──
 @app.post("/api/vision/analyze")
 async def vision_analyze(file: UploadFile = File(...)):
@@ -209,6 +282,97 @@ async def vision_analyze(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Vision analysis failed: {str(e)}")
 
 
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp")
+
+
+_UPLOAD_CHUNK = 1024 * 1024
+
+
+def _batch_too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=413, detail=detail)
+
+
+async def _read_capped(upload: UploadFile, budget: int) -> bytes:
+    """Read an upload in chunks, stopping with 413 as soon as it exceeds `budget` bytes."""
+    chunks, size = [], 0
+    while chunk := await upload.read(_UPLOAD_CHUNK):
+        size += len(chunk)
+        if size > budget:
+            raise _batch_too_large(f"At most {VISION_BATCH_MAX_BYTES} bytes of images per batch")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _expand_zip(data: bytes, already: int, already_bytes: int) -> list[tuple[str, bytes]]:
+    """
+    Extract image members (by extension) from an uploaded zip archive.
+
+    Member count and declared uncompressed sizes are checked against the batch
+    limits, together with the images already collected, before anything is
+    decompressed.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(_IMAGE_EXTENSIONS)
+        ]
+        if already + len(members) > VISION_BATCH_MAX_FILES:
+            raise _batch_too_large(f"At most {VISION_BATCH_MAX_FILES} images per batch")
+        if already_bytes + sum(info.file_size for info in members) > VISION_BATCH_MAX_BYTES:
+            raise _batch_too_large(f"At most {VISION_BATCH_MAX_BYTES} bytes of images per batch")
+        return [(info.filename, archive.read(info)) for info in members]
+
+
+@app.post("/api/vision/analyze/batch")
+async def vision_analyze_batch(files: list[UploadFile] = File(...)):
+    """
+    Upload many leaf images (or zip archives of images) from one plot survey.
+    Streams NDJSON: one line per image as it completes, then a summary line
+    with the plot's disease distribution.
+    """
+    images: list[tuple[str, bytes]] = []
+    total_bytes = 0
+    for upload in files:
+        # Stop reading once the batch byte budget is spent; a zip's compressed size counts too
+        data = await _read_capped(upload, VISION_BATCH_MAX_BYTES - total_bytes)
+        name = upload.filename or "upload"
+        if upload.content_type in ("application/zip", "application/x-zip-compressed") or name.lower().endswith(".zip"):
+            try:
+                expanded = await asyncio.to_thread(_expand_zip, data, len(images), total_bytes)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"{name} is not a valid zip archive")
+            images.extend(expanded)
+            total_bytes += sum(len(image) for _, image in expanded)
+        elif upload.content_type and upload.content_type.startswith("image/"):
+            images.append((name, data))
+            total_bytes += len(data)
+        else:
+            raise HTTPException(status_code=400, detail=f"{name} must be an image or a zip of images")
+
+        if len(images) > VISION_BATCH_MAX_FILES:
+            raise _batch_too_large(f"At most {VISION_BATCH_MAX_FILES} images per batch")
+        if total_bytes > VISION_BATCH_MAX_BYTES:
+            raise _batch_too_large(f"At most {VISION_BATCH_MAX_BYTES} bytes of images per batch")
+
+    if not images:
+        raise HTTPException(status_code=400, detail="No images found in upload")
+
+    async def ndjson():
+        async for item in analyze_images(images):
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@app.get("/api/vision/metrics")
+async def vision_metrics():
+    """Micro-batching metrics (batch sizes, queue wait, inference time) and result-cache hit rates."""
+    return {
+        "batcher": get_batcher().metrics(),
+        "cache":   get_result_cache().stats(),
+    }
+
+
 # ── Climate Risk Agent ──
 @app.get("/api/climate/risk")
 async def climate_risk(
@@ -223,6 +387,38 @@ async def climate_risk(
         raise HTTPException(status_code=500, detail=f"Climate analysis failed: {str(e)}")
 
 
+@app.get("/api/climate/risk-curve")
+async def climate_risk_curve(
+    lat: float = Query(..., description="Latitude", ge=-90, le=90),
+    lon: float = Query(..., description="Longitude", ge=-180, le=180),
+    days: int = Query(7, description="Forecast days", ge=1, le=16),
+):
+    """Hourly outbreak probability curve and per-day peaks from the Open-Meteo forecast."""
+    try:
+        return await get_outbreak_curve(lat, lon, days)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Climate forecast failed: {str(e)}")
+
+
+@app.get("/api/climate/heatmap")
+async def climate_heatmap(
+    south: float = Query(..., description="Southern latitude", ge=-90, le=90),
+    west: float = Query(..., description="Western longitude", ge=-180, le=180),
+    north: float = Query(..., description="Northern latitude", ge=-90, le=90),
+    east: float = Query(..., description="Eastern longitude", ge=-180, le=180),
+    resolution: float = Query(0.1, description="Cell size in degrees", gt=0, le=5),
+):
+    """Outbreak risk for every grid cell in a bounding box, as row-major arrays."""
+    if north < south or east < west:
+        raise HTTPException(status_code=400, detail="Bounding box must satisfy south <= north and west <= east")
+    try:
+        return await get_risk_heatmap(south, west, north, east, resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Climate heatmap failed: {str(e)}")
+
+
 # ── Satellite Health Agent ──
 @app.get("/api/satellite/health")
 async def satellite_health(
@@ -238,9 +434,29 @@ async def satellite_health(
 
 
 # ── Orchestration Engine ──
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
 @app.post("/api/orchestrate")
-async def orchestrate(agent_input: AgentInput):
-    """Synthesize all agent outputs using Groq LLM for unified recommendations."""
+async def orchestrate(
+    agent_input: AgentInput,
+    stream: bool = Query(False, description="Stream agent results and LLM tokens as server-sent events"),
+):
+    """Synthesize all agent outputs into unified recommendations (rules first, Groq LLM when needed)."""
+    if stream:
+        async def _events():
+            try:
+                async for event, payload in stream_orchestration(agent_input.model_dump()):
+                    yield _sse(event, payload)
+            except Exception as e:
+                yield _sse("error", {"detail": f"Orchestration failed: {str(e)}"})
+
+        return StreamingResponse(_events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
     try:
         result = await run_orchestration(agent_input.model_dump())
         return result
@@ -256,7 +472,7 @@ async def orchestrate(agent_input: AgentInput):
 async def market_filters():
     """Return topology (State->District) and commodities from CSV filenames."""
     try:
-        return get_available_filters()
+        return await run_coalesced(("filters",), get_available_filters)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Filter discovery failed: {str(e)}")
 
@@ -272,23 +488,10 @@ async def market_intelligence(
     Full market intelligence: price card + trend chart + trade recommendation.
     Powered by uploaded CSV files (backend/data/*.csv).
     """
-    import asyncio
     try:
-        raw, series = await asyncio.gather(
-            get_market_data(region, commodity),
-            get_price_trend_series(region, commodity, days=days),
-        )
-        from domains.market.market_signals import compute_price_momentum
-        enriched       = enrich_market_data(raw, series)
-        momentum       = compute_price_momentum(series)
-        enriched["momentum"] = momentum
-        recommendation = compute_trade_recommendation(
-            trend        = enriched.get("trend", "stable"),
-            buyer_signal = enriched.get("buyer_signal", "Stable"),
-            momentum     = momentum.get("momentum", "neutral"),
-        )
-        chart   = to_chart_series(series)
-        summary = to_market_summary(enriched, recommendation)
+        snapshot = await get_market_snapshot(region, commodity, days=days)
+        chart    = to_chart_series(snapshot["series"])
+        summary  = to_market_summary(snapshot["enriched"], snapshot["recommendation"])
         summary["chart"] = chart
         return summary
     except Exception as e:
@@ -302,10 +505,15 @@ async def market_records(
     commodity: str = Query("Banana",          description="Commodity name"),
     page:      int = Query(1,                 description="Page number", ge=1),
     page_size: int = Query(50,                description="Records per page", ge=10, le=200),
+    cursor:    str | None = Query(None,       description="next_cursor from the previous page (overrides page)"),
+    layout:    str = Query("records",         description="records | columnar"),
 ):
     """Paginated individual records for the data table."""
     try:
-        return get_market_records(region, commodity, page, page_size)
+        result = await get_market_records(region, commodity, page, page_size, cursor, layout)
+        return Response(content=encode_json(result), media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Market records fetch failed: {str(e)}")
 
@@ -335,9 +543,12 @@ class ChatRequest(BaseModel):
     messages: List[ChatMessage]
 
 @app.post("/api/assistant/chat")
-async def assistant_chat(req: ChatRequest):
+async def assistant_chat(
+    req: ChatRequest,
+    stream: bool = Query(False, description="Stream the reply as server-sent events"),
+):
     """AI farming assistant powered by Groq LLM."""
-    from config import GROQ_API_KEY, GROQ_MODEL
+    from config import GROQ_API_KEY
     import httpx
 
     if not GROQ_API_KEY:
@@ -359,25 +570,24 @@ async def assistant_chat(req: ChatRequest):
         if m.role in ("user", "assistant"):
             groq_messages.append({"role": m.role, "content": m.content})
 
+    if stream:
+        async def _events():
+            parts = []
+            try:
+                async for delta in stream_chat_completion(groq_messages, temperature=0.7, max_tokens=1024):
+                    parts.append(delta)
+                    yield _sse("token", {"text": delta})
+                yield _sse("done", {"reply": "".join(parts)})
+            except httpx.HTTPStatusError as e:
+                yield _sse("error", {"detail": f"Groq API error: {e.response.text}"})
+            except Exception as e:
+                yield _sse("error", {"detail": f"Chat failed: {str(e)}"})
+
+        return StreamingResponse(_events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": GROQ_MODEL,
-                    "messages": groq_messages,
-                    "temperature": 0.7,
-                    "max_tokens": 1024,
-                },
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            reply = data["choices"][0]["message"]["content"]
-            return {"reply": reply}
+        reply = await chat_completion(groq_messages, temperature=0.7, max_tokens=1024)
+        return {"reply": reply}
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=502, detail=f"Groq API error: {e.response.text}")
     except Exception as e:
@@ -10,7 +10,7 @@ Tables:
 import uuid
 from datetime import datetime
 from sqlalchemy import (
-    Column, String, Float, Boolean, Integer, Text, DateTime, JSON, ForeignKey
+    Column, String, Float, Boolean, Integer, Text, DateTime, JSON, ForeignKey, Index
 )
 from database import Base
 
@@ -56,6 +56,11 @@ class FarmerProfile(Base):
     created_at    = Column(DateTime, default=datetime.utcnow)
     updated_at    = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_farmer_region_commodity", "primary_region", "primary_commodity"),
+        Index("ix_farmer_district", "district"),
+    )
+
 
 # ────────────────────────────────
 # Crop Listing (farmer sells crop)
@@ -79,7 +84,15 @@ class CropListing(Base):
     status                = Column(String, default="active")  # active | sold | expired | withdrawn
     views_count           = Column(Integer, default=0)
     inquiries_count       = Column(Integer, default=0)
-    created_at            = Column(DateTime, default=datetime.utcnow)
+    created_at            = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Search filters first, then the keyset (created_at, id) for cursor paging
+    __table_args__ = (
+        Index("ix_crop_farmer_created", "farmer_id", "created_at", "id"),
+        Index("ix_crop_status_crop_created", "status", "crop_name", "created_at", "id"),
+        Index("ix_crop_status_district_created", "status", "district", "created_at", "id"),
+        Index("ix_crop_status_created", "status", "created_at", "id"),
+    )
 
 
 # ──────────────────────────────────────
@@ -104,7 +117,13 @@ class InputListing(Base):
     delivery_charge    = Column(Float, default=0.0)
     images             = Column(JSON, default=list)
     status             = Column(String, default="available")  # available | out_of_stock | discontinued
-    created_at         = Column(DateTime, default=datetime.utcnow)
+    created_at         = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_input_farmer_created", "farmer_id", "created_at", "id"),
+        Index("ix_input_status_category_created", "status", "category", "created_at", "id"),
+        Index("ix_input_status_created", "status", "created_at", "id"),
+    )
 
 
 # ─────────────────────────────────────
@@ -123,4 +142,10 @@ class BuyerInquiry(Base):
     quantity_needed = Column(Float, default=0.0)
     message         = Column(Text, default="")
     status          = Column(String, default="pending")  # pending | accepted | rejected | completed
-    created_at      = Column(DateTime, default=datetime.utcnow)
+    created_at      = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_inquiry_listing_created", "listing_id", "created_at", "id"),
+        Index("ix_inquiry_listing_status_created", "listing_id", "status", "created_at", "id"),
+        Index("ix_inquiry_status_created", "status", "created_at", "id"),
+    )
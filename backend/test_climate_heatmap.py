@@ -0,0 +1,86 @@
+"""
+Region heatmap: batch fan-out stays within HEATMAP_CONCURRENCY, and cells
+with null Open-Meteo readings (or a failed batch) come back as null instead
+of failing the whole grid. The upstream batch fetch is replaced in-process.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from agents import climate_agent  # noqa: E402
+from cache import SWRCache  # noqa: E402
+
+
+def _reading(lat: float) -> dict:
+    current = {
+        "temperature_2m": 24.0,
+        "relative_humidity_2m": 92.0,
+        "precipitation": 3.0,
+        "wind_speed_10m": 4.0,
+    }
+    if lat == 10.0:   # first row has no humidity reading
+        current["relative_humidity_2m"] = None
+    return {"current": current}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(climate_agent, "_climate_cache", SWRCache(ttl=60, stale_ttl=60, maxsize=1000))
+    monkeypatch.setattr(climate_agent, "CLIMATE_GRID_RES", 0.05)
+    monkeypatch.setattr(climate_agent, "HEATMAP_BATCH_SIZE", 2)
+    monkeypatch.setattr(climate_agent, "HEATMAP_CONCURRENCY", 2)
+
+
+def _heatmap():
+    return asyncio.run(climate_agent.get_risk_heatmap(10.0, 76.0, 10.2, 76.2, 0.05))
+
+
+def test_fan_out_is_bounded(monkeypatch):
+    in_flight = peak = 0
+
+    async def fetch(cells):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [_reading(lat) for lat, _ in cells]
+
+    monkeypatch.setattr(climate_agent, "_fetch_current_weather_batch", fetch)
+    result = _heatmap()
+
+    assert result["upstream_calls"] > 2
+    assert peak == 2
+
+
+def test_null_readings_and_failed_batches_leave_gaps(monkeypatch):
+    async def fetch(cells):
+        if (10.05, 76.05) in cells:
+            raise RuntimeError("upstream 502")
+        return [_reading(lat) for lat, _ in cells]
+
+    monkeypatch.setattr(climate_agent, "_fetch_current_weather_batch", fetch)
+    result = _heatmap()
+
+    grid = result["outbreak_probability"]
+    assert grid[0] == [None] * len(result["lons"])
+    assert grid[1][1:3] == [None, None]
+    assert result["cells_missing"] == len(result["lons"]) + 2
+    assert all(p == 85.0 for row in grid[1:] for p in row if p is not None)
+
+
+def test_every_batch_failing_raises(monkeypatch):
+    async def fetch(cells):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(climate_agent, "_fetch_current_weather_batch", fetch)
+    with pytest.raises(RuntimeError):
+        _heatmap()
+
+
+def test_score_weather_treats_null_as_missing():
+    result = climate_agent._score_weather({"current": {"temperature_2m": 20.0, "wind_speed_10m": None}})
+    assert result["wind_speed"] == 0
+    assert result["rainfall"] == 0
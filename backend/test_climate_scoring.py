@@ -0,0 +1,55 @@
+"""
+The vectorised climate scorers must agree exactly with the scalar ones.
+
+Inputs cover every band edge of each factor and a dense temperature sweep
+whose scores land on .x5 ties, where np.round and round() can disagree.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agents.climate_agent import (  # noqa: E402
+    _classify_risk,
+    _classify_risk_vec,
+    _compute_outbreak_probability,
+    _compute_outbreak_probability_vec,
+)
+from agents.numeric import round_like_python  # noqa: E402
+
+TEMPERATURES = [-5.0, 9.99, 10.0, 17.99, 18.0, 24.0, 28.0, 28.01, 35.0, 35.01, 45.0]
+HUMIDITIES = [0.0, 59.9, 60.0, 69.9, 70.0, 79.9, 80.0, 89.9, 90.0, 100.0]
+RAINFALLS = [0.0, 0.1, 5.0, 5.1, 10.0, 10.1, 20.0, 20.1, 80.0]
+WIND_SPEEDS = [0.0, 4.9, 5.0, 9.9, 10.0, 19.9, 20.0, 60.0]
+
+# Steps of 0.0125°C around the peak put the temperature factor on .x5 values
+TIE_SWEEP = np.round(np.arange(17.5, 28.5, 0.0125), 4).tolist()
+
+
+def _grid(temperatures):
+    t, h, r, w = np.meshgrid(temperatures, HUMIDITIES, RAINFALLS, WIND_SPEEDS, indexing="ij")
+    return t.ravel(), h.ravel(), r.ravel(), w.ravel()
+
+
+@pytest.mark.parametrize("temperatures", [TEMPERATURES, TIE_SWEEP], ids=["band_edges", "tie_sweep"])
+def test_outbreak_probability_vec_matches_scalar(temperatures):
+    t, h, r, w = _grid(temperatures)
+
+    vec = _compute_outbreak_probability_vec(t, h, r, w)
+    scalar = [
+        _compute_outbreak_probability(float(a), float(b), float(c), float(d))
+        for a, b, c, d in zip(t, h, r, w)
+    ]
+
+    assert vec.tolist() == scalar
+
+
+def test_classify_risk_vec_matches_scalar():
+    probabilities = [0.0, 39.9, 40.0, 69.9, 70.0, 100.0]
+    assert _classify_risk_vec(np.array(probabilities)).tolist() == [_classify_risk(p) for p in probabilities]
+
+
+@pytest.mark.parametrize("ndigits", [1, 2])
+def test_round_like_python_matches_builtin_on_ties(ndigits):
+    step = 10.0 ** -(ndigits + 1)
+    values = np.arange(0, 100, step * 5)   # every other value is a .5 tie
+    assert round_like_python(values, ndigits).tolist() == [round(float(v), ndigits) for v in values]
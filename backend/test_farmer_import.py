@@ -0,0 +1,98 @@
+"""
+Bulk farmer import: errors carry physical line numbers, a chunk rejected by
+the database is reported by line range without stopping the import, and a
+read error mid-file keeps the chunks already inserted.
+
+Runs against an in-memory SQLite database; skipped without SQLAlchemy/pydantic.
+"""
+import io
+import itertools
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("pandas")   # domains.farmer imports the market domain
+sqlalchemy = pytest.importorskip("sqlalchemy")
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from database import Base  # noqa: E402
+from domains.farmer import farmer_import  # noqa: E402
+from domains.farmer.farmer_import import import_farmers, text_stream  # noqa: E402
+from models.db_models import FarmerProfile  # noqa: E402
+
+
+@pytest.fixture
+def engine():
+    engine = sqlalchemy.create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine, tables=[FarmerProfile.__table__])
+    yield engine
+    engine.dispose()
+
+
+def _stored(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(sqlalchemy.select(sqlalchemy.func.count()).select_from(FarmerProfile.__table__)).scalar()
+
+
+def test_csv_errors_use_file_line_numbers(engine):
+    data = "full_name,land_size\nAsha,2\nRavi,lots\nMeena,1.5\n,abc\n"
+
+    report = import_farmers(io.StringIO(data), "csv", engine)
+
+    assert report["inserted"] == 2
+    assert [e["row"] for e in report["errors"]] == [3, 5]   # header is line 1
+
+
+def test_ndjson_errors_count_blank_lines(engine):
+    data = '{"full_name": "Asha"}\n\n{"land_size": "lots"}\n\nnot json\n{"full_name": "Meena"}\n'
+
+    report = import_farmers(io.StringIO(data), "ndjson", engine)
+
+    assert report["inserted"] == 2
+    assert [e["row"] for e in report["errors"]] == [3, 5]
+
+
+def test_rejected_chunk_is_reported_and_import_continues(engine, monkeypatch):
+    # Second chunk reuses an id from the first → IntegrityError for that chunk only
+    ids = iter(["a", "b", "a", "c", "d", "e"])
+    monkeypatch.setattr(farmer_import.uuid, "uuid4", lambda: next(ids))
+    data = "full_name\n" + "".join(f"F{i}\n" for i in range(6))
+
+    report = import_farmers(io.StringIO(data), "csv", engine, chunk_size=2)
+
+    assert report["inserted"] == 4
+    assert report["failed"] == 2
+    assert report["chunks"] == 3
+    assert [e["rows"] for e in report["chunk_errors"]] == [[4, 5]]
+    assert "UNIQUE" in report["chunk_errors"][0]["error"]
+    assert _stored(engine) == 4
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_read_error_keeps_progress(engine, fmt):
+    if fmt == "csv":
+        good = "full_name\n" + "".join(f"F{i}\n" for i in range(3000))
+    else:
+        good = "".join(f'{{"full_name": "F{i}"}}\n' for i in range(3000))
+    # Invalid UTF-8 well past the first decoded block
+    raw = good.encode() + b"\xff\xfe broken\n" + b"more\n"
+
+    report = import_farmers(text_stream(io.BytesIO(raw)), fmt, engine, chunk_size=500)
+
+    assert report["read_error"] is not None
+    assert "utf-8" in report["read_error"]["error"]
+    assert report["inserted"] == _stored(engine) > 0
+    assert report["read_error"]["row"] > report["inserted"]
+    assert report["chunk_errors"] == []
+
+
+def test_clean_import_reports_no_read_error(engine):
+    data = "".join(itertools.repeat('{"full_name": "Asha"}\n', 5))
+
+    report = import_farmers(io.StringIO(data), "ndjson", engine, chunk_size=2)
+
+    assert report["inserted"] == 5
+    assert report["chunks"] == 3
+    assert report["read_error"] is None
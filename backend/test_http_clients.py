@@ -0,0 +1,92 @@
+"""
+Pooled upstream clients: repeated calls share one client (and so one
+connection pool) per upstream, and close_http_clients releases them.
+
+Uses httpx.MockTransport in place of the network; skipped without httpx.
+"""
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+import http_clients  # noqa: E402
+
+
+class _RecordingTransport(httpx.MockTransport):
+    def __init__(self):
+        self.requests = []
+        self.closed = False
+        super().__init__(self._handle)
+
+    def _handle(self, request):
+        self.requests.append(request)
+        return httpx.Response(200, json={"ok": True})
+
+    async def aclose(self):
+        self.closed = True
+
+
+def _upstream_stats(name: str) -> dict:
+    return http_clients.http_client_stats()["upstreams"][name]
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = _RecordingTransport()
+    monkeypatch.setattr(http_clients, "_transport", transport)
+    monkeypatch.setattr(http_clients, "_clients", {})
+    monkeypatch.setattr(http_clients, "_stats", {})
+    return transport
+
+
+def test_repeated_calls_reuse_one_client(transport, monkeypatch):
+    made = []
+    make_client = http_clients._make_client
+    monkeypatch.setattr(http_clients, "_make_client", lambda name: made.append(name) or make_client(name))
+
+    async def run():
+        clients = set()
+        for _ in range(5):
+            client = http_clients.get_client("open_meteo")
+            clients.add(id(client))
+            response = await client.get("https://upstream.test/forecast")
+            assert response.json() == {"ok": True}
+        await http_clients.close_http_clients()
+        return clients
+
+    clients = asyncio.run(run())
+
+    assert len(clients) == 1
+    assert made == ["open_meteo"]
+    assert len(transport.requests) == 5
+    assert _upstream_stats("open_meteo") == {"requests": 5, "errors": 0}
+
+
+def test_close_releases_every_pool(transport):
+    async def run():
+        await http_clients.start_http_clients()
+        clients = dict(http_clients._clients)
+        await http_clients.close_http_clients()
+        return clients
+
+    clients = asyncio.run(run())
+
+    assert set(clients) == set(http_clients.UPSTREAM_TIMEOUTS)
+    assert all(client.is_closed for client in clients.values())
+    assert transport.closed
+    assert http_clients._clients == {}
+
+
+def test_closed_client_is_replaced(transport):
+    async def run():
+        first = http_clients.get_client("groq")
+        await http_clients.close_http_clients()
+        second = http_clients.get_client("groq")
+        await http_clients.close_http_clients()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
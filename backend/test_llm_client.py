@@ -0,0 +1,155 @@
+"""
+LLM client retry, backoff and concurrency behaviour against an
+httpx.MockTransport standing in for the Groq API; skipped without httpx.
+"""
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+import http_clients  # noqa: E402
+import llm_client  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _completion(content: str = "ok") -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route the pooled groq client through `upstream.handler`; record backoff sleeps."""
+    class Upstream:
+        handler = None
+        requests = []
+        sleeps = []
+
+    async def handle(request):
+        Upstream.requests.append(request)
+        return await Upstream.handler(request)
+
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        Upstream.sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(http_clients, "_transport", httpx.MockTransport(handle))
+    monkeypatch.setattr(http_clients, "_clients", {})
+    monkeypatch.setattr(http_clients, "_stats", {})
+    monkeypatch.setattr(llm_client, "GROQ_API_KEY", "test-key")
+    monkeypatch.setattr(llm_client, "GROQ_BASE_URL", "https://llm.test/v1")
+    monkeypatch.setattr(llm_client, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(llm_client, "_semaphore", None)
+    monkeypatch.setattr(llm_client, "_stats", {"calls": 0, "retries": 0, "failures": 0, "waiting": 0})
+    monkeypatch.setattr(llm_client.asyncio, "sleep", fake_sleep)
+    Upstream.real_sleep = real_sleep
+    return Upstream
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await http_clients.close_http_clients()
+    return asyncio.run(main())
+
+
+def test_429_honours_retry_after(upstream):
+    responses = iter([httpx.Response(429, headers={"Retry-After": "2"}), _completion("done")])
+
+    async def handler(request):
+        return next(responses)
+
+    upstream.handler = handler
+    assert _run(llm_client.chat_completion(MESSAGES)) == "done"
+
+    assert upstream.sleeps == [2.0]
+    assert len(upstream.requests) == 2
+    assert llm_client._stats["retries"] == 1
+    assert upstream.requests[0].headers["authorization"] == "Bearer test-key"
+
+
+def test_5xx_retries_until_exhausted(upstream):
+    async def handler(request):
+        return httpx.Response(503)
+
+    upstream.handler = handler
+    with pytest.raises(httpx.HTTPStatusError):
+        _run(llm_client.chat_completion(MESSAGES))
+
+    assert len(upstream.requests) == llm_client.LLM_MAX_RETRIES + 1
+    assert len(upstream.sleeps) == llm_client.LLM_MAX_RETRIES
+    assert llm_client._stats["failures"] == 1
+
+
+def test_4xx_is_not_retried(upstream):
+    async def handler(request):
+        return httpx.Response(400)
+
+    upstream.handler = handler
+    with pytest.raises(httpx.HTTPStatusError):
+        _run(llm_client.chat_completion(MESSAGES))
+
+    assert len(upstream.requests) == 1
+    assert upstream.sleeps == []
+
+
+def test_concurrency_is_capped(upstream, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_MAX_CONCURRENCY", 2)
+    in_flight = peak = 0
+    waiting_seen = []
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        waiting_seen.append(llm_client._stats["waiting"])
+        for _ in range(5):
+            await upstream.real_sleep(0)
+        in_flight -= 1
+        return _completion()
+
+    upstream.handler = handler
+
+    async def burst():
+        return await asyncio.gather(*(llm_client.chat_completion(MESSAGES) for _ in range(6)))
+
+    assert _run(burst()) == ["ok"] * 6
+    assert peak == 2
+    assert max(waiting_seen) > 0
+    assert llm_client._stats["waiting"] == 0
+    assert llm_client._stats["calls"] == 6
+
+
+def test_cancelled_waiter_leaves_no_waiting_count(upstream, monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_MAX_CONCURRENCY", 1)
+    release = None
+
+    async def handler(request):
+        await release.wait()
+        return _completion()
+
+    upstream.handler = handler
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        holder = asyncio.create_task(llm_client.chat_completion(MESSAGES))
+        waiter = asyncio.create_task(llm_client.chat_completion(MESSAGES))
+        while llm_client._stats["waiting"] == 0:
+            await upstream.real_sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        waiting_after_cancel = llm_client._stats["waiting"]
+        release.set()
+        await holder
+        return waiting_after_cancel
+
+    assert _run(scenario()) == 0
+    assert llm_client._stats["waiting"] == 0
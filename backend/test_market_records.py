@@ -0,0 +1,101 @@
+"""
+Market record paging: walking the cursor pages of a region file returns every
+row of the commodity once, newest first, formatted like the whole slice, and
+a cursor from an older revision of the file is rejected.
+
+Uses a generated region CSV in a temporary data directory; skipped without pandas.
+"""
+import asyncio
+import os
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from domains.market import market_analyze  # noqa: E402
+from domains.market.market_analyze import RECORD_FIELDS, get_market_records  # noqa: E402
+
+REGION = "Testland_Testdistrict"
+
+
+def _write_region(directory, rows: int) -> None:
+    lines = ["State,District,Market,Commodity,Variety,Grade,Arrival_Date,Min_Price,Max_Price,Modal_Price,Commodity_Code"]
+    for i in range(rows):
+        commodity = "Tomato" if i % 3 else "Onion"
+        day = 1 + i % 28
+        month = 1 + (i // 28) % 12
+        modal = "" if i % 17 == 0 else str(1000 + i)   # some missing prices
+        lines.append(
+            f"Testland,Testdistrict,Market {i % 4},{commodity},Local,FAQ,"
+            f"{day:02d}/{month:02d}/2024,{900 + i},{1100 + i},{modal},{78 if commodity == 'Tomato' else 23}"
+        )
+    (directory / f"{REGION}.csv").write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(market_analyze, "DATA_DIR", tmp_path)
+    market_analyze._load_region_version.cache_clear()
+    _write_region(tmp_path, 300)
+    yield tmp_path
+    market_analyze._load_region_version.cache_clear()
+
+
+def _walk(commodity: str, page_size: int, layout: str = "records") -> list[dict]:
+    async def main():
+        records, cursor = [], None
+        while True:
+            page = await get_market_records(REGION, commodity, page_size=page_size, cursor=cursor, layout=layout)
+            assert "error" not in page, page.get("error")
+            if layout == "columnar":
+                columns = page["columns"]
+                records.extend(dict(zip(RECORD_FIELDS, row)) for row in zip(*(columns[f] for f in RECORD_FIELDS)))
+            else:
+                records.extend(page["records"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return records, page["total"]
+    return asyncio.run(main())
+
+
+def _whole_slice(commodity: str) -> list[dict]:
+    df = market_analyze._load_region(f"{REGION}.csv").slice(commodity)
+    columns = market_analyze._record_columns(df)
+    return [dict(zip(RECORD_FIELDS, row)) for row in zip(*(columns[f] for f in RECORD_FIELDS))]
+
+
+@pytest.mark.parametrize("page_size", [1, 7, 50, 500])
+def test_pages_match_whole_slice(data_dir, page_size):
+    records, total = _walk("tomato", page_size)
+
+    assert total == 200
+    assert records == _whole_slice("Tomato")
+
+
+def test_columnar_layout_matches_records(data_dir):
+    assert _walk("Onion", 13, layout="columnar")[0] == _walk("Onion", 13)[0]
+
+
+def test_missing_prices_are_zero(data_dir):
+    records, _ = _walk("Onion", 50)
+    assert all(isinstance(r["modal_price"], float) for r in records)
+    assert any(r["modal_price"] == 0.0 for r in records)
+
+
+def test_cursor_expires_when_file_changes(data_dir):
+    async def first_page():
+        return await get_market_records(REGION, "Tomato", page_size=10)
+
+    cursor = asyncio.run(first_page())["next_cursor"]
+    _write_region(data_dir, 310)
+    path = data_dir / f"{REGION}.csv"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    with pytest.raises(ValueError, match="Cursor expired"):
+        asyncio.run(get_market_records(REGION, "Tomato", page_size=10, cursor=cursor))
+
+
+def test_bad_cursor_is_rejected(data_dir):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        asyncio.run(get_market_records(REGION, "Tomato", cursor="not-a-cursor"))
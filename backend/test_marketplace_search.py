@@ -0,0 +1,133 @@
+"""
+Marketplace keyset paging: walking every page returns each row exactly once,
+including runs of rows with the same created_at and legacy rows whose
+created_at was backfilled, and a malformed cursor is rejected.
+
+Runs against in-memory SQLite; skipped without SQLAlchemy/aiosqlite.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from database import LEGACY_CREATED_AT, Base, _backfill_created_at  # noqa: E402
+from domains.marketplace import search_inquiries  # noqa: E402
+from models.db_models import BuyerInquiry  # noqa: E402
+
+T0 = datetime(2024, 6, 1, 9, 0, 0)
+
+
+def _inquiry(i: int, created_at: datetime, status: str = "pending") -> dict:
+    return {
+        "id": f"inq-{i:03d}", "listing_id": "listing-1", "listing_type": "crop",
+        "buyer_name": f"Buyer {i}", "status": status, "created_at": created_at,
+    }
+
+
+def _rows() -> list[dict]:
+    # Runs of 1, 5 and 7 rows sharing a timestamp, so pages end mid-run
+    rows, i = [], 0
+    for minutes, run in [(0, 1), (1, 5), (2, 1), (3, 7), (4, 2)]:
+        for _ in range(run):
+            rows.append(_inquiry(i, T0 + timedelta(minutes=minutes), "pending" if i % 3 else "accepted"))
+            i += 1
+    return rows
+
+
+def _run(rows: list[dict], pages):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[BuyerInquiry.__table__])
+            if rows:
+                await conn.execute(sqlalchemy.insert(BuyerInquiry.__table__), rows)
+        try:
+            async with AsyncSession(engine) as db:
+                return await pages(db)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+async def _walk(db, limit: int, **filters) -> tuple[list[str], int]:
+    seen, cursor, calls = [], None, 0
+    while True:
+        page = await search_inquiries(db, limit=limit, cursor=cursor, **filters)
+        calls += 1
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen, calls
+
+
+def _expected(rows: list[dict]) -> list[str]:
+    ordered = sorted(rows, key=lambda r: (r["created_at"], r["id"]), reverse=True)
+    return [r["id"] for r in ordered]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 5, 16, 200])
+def test_pages_cover_every_row_once(limit):
+    rows = _rows()
+    seen, calls = _run(rows, lambda db: _walk(db, limit))
+
+    assert seen == _expected(rows)
+    assert calls == max(1, -(-len(rows) // limit))
+
+
+def test_pages_with_filter():
+    rows = _rows()
+    seen, _ = _run(rows, lambda db: _walk(db, 2, status="pending"))
+
+    assert seen == _expected([r for r in rows if r["status"] == "pending"])
+
+
+def test_backfilled_rows_page_last():
+    rows = _rows() + [_inquiry(100 + i, LEGACY_CREATED_AT) for i in range(3)]
+    seen, _ = _run(rows, lambda db: _walk(db, 4))
+
+    assert seen == _expected(rows)
+    assert seen[-3:] == ["inq-102", "inq-101", "inq-100"]
+
+
+# Not base64 JSON, an empty list, and a non-date timestamp
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJub3QtYS1kYXRlIiwieCJd"])
+def test_bad_cursor_is_rejected(cursor):
+    async def pages(db):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await search_inquiries(db, cursor=cursor)
+    _run([], pages)
+
+
+def test_backfill_sets_null_created_at():
+    engine = sqlalchemy.create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        # Tables as an older jomee.db created them: created_at nullable
+        for name in ("crop_listings", "input_listings", "buyer_inquiries", "farmer_profiles"):
+            conn.exec_driver_sql(f"CREATE TABLE {name} (id VARCHAR PRIMARY KEY, created_at DATETIME)")
+        conn.exec_driver_sql("INSERT INTO buyer_inquiries VALUES ('old', NULL), ('new', '2024-06-01 09:00:00')")
+
+    _backfill_created_at(engine)
+
+    with engine.connect() as conn:
+        values = dict(conn.exec_driver_sql("SELECT id, created_at FROM buyer_inquiries").fetchall())
+    assert values["new"] == "2024-06-01 09:00:00"
+    assert values["old"] is not None and values["old"].startswith("1970-01-01")
+    engine.dispose()
+
+
+def test_bad_cursor_is_400():
+    pytest.importorskip("torch")   # main imports the vision agent
+    pytest.importorskip("transformers")
+    from fastapi.testclient import TestClient
+    import main
+
+    response = TestClient(main.app).get("/api/marketplace/inquiries", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
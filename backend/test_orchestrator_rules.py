@@ -0,0 +1,96 @@
+"""
+Rule-based orchestration: which agent combinations are answered locally and
+which escalate to the LLM, and where the consensus gate
+(ORCHESTRATION_CONFIDENCE_GATE) draws the line.
+"""
+import pytest
+
+from agents.orchestrator_rules import synthesize
+from config import ORCHESTRATION_CONFIDENCE_GATE
+
+CLIMATE_LOW = {"outbreak_probability": 20.0}
+CLIMATE_HIGH = {"outbreak_probability": 80.0}
+SATELLITE_LOW = {"ndvi_score": 0.72, "health_trend": "Stable"}
+SATELLITE_HIGH = {"ndvi_score": 0.30, "health_trend": "Declining"}
+MARKET_RISING = {"trend": "up", "buyer_signal": "Strong Demand", "momentum": {"momentum": "rising"}}
+MARKET_STABLE = {"trend": "stable", "buyer_signal": "Stable", "momentum": {"momentum": "neutral"}}
+MARKET_FALLING = {"trend": "down", "buyer_signal": "Oversupply", "momentum": {"momentum": "falling"}}
+VISION_DISEASE = {"disease_name": "Tomato Late Blight", "confidence": 82.0}
+VISION_HEALTHY = {"disease_name": "Tomato Healthy", "confidence": 90.0}
+FAILED = {"status": "error", "message": "upstream timeout"}
+
+
+def _run(climate=CLIMATE_LOW, satellite=SATELLITE_LOW, market=MARKET_RISING, vision=None,
+         gate=ORCHESTRATION_CONFIDENCE_GATE):
+    return synthesize("Kerala", "Tomato", climate, satellite, market, vision, confidence_gate=gate)
+
+
+# (case, inputs, expected escalations, risk level, recommendation)
+CASES = [
+    ("low_risk_rising_market", {}, [], "Low", "BUY"),
+    ("low_risk_falling_market", {"market": MARKET_FALLING}, [], "Low", "SELL"),
+    ("low_risk_stable_market", {"market": MARKET_STABLE}, [], "Low", "HOLD"),
+    ("high_climate_risk", {"climate": CLIMATE_HIGH}, ["high disease risk"], "High", "HOLD"),
+    ("high_risk_falling_market", {"climate": CLIMATE_HIGH, "market": MARKET_FALLING},
+     ["high disease risk"], "High", "SELL"),
+    ("vision_disease_vs_low_climate", {"vision": VISION_DISEASE},
+     ["conflict: Vision detects disease while climate risk is Low.", "high disease risk"], "High", "HOLD"),
+    ("vision_healthy_vs_high_climate", {"climate": CLIMATE_HIGH, "vision": VISION_HEALTHY},
+     ["conflict: Vision reports a healthy leaf while climate risk is High.", "high disease risk"],
+     "High", "HOLD"),
+    ("low_climate_vs_high_stress", {"satellite": SATELLITE_HIGH},
+     ["conflict: Climate risk is Low but vegetation stress is High."], "Moderate", "BUY"),
+    ("climate_failed", {"climate": FAILED}, ["climate data unavailable"], "Moderate", "BUY"),
+    ("satellite_missing", {"satellite": None}, ["satellite data unavailable"], "Low", "BUY"),
+    ("market_failed", {"market": FAILED}, ["market data unavailable"], "Low", "HOLD"),
+]
+
+
+@pytest.mark.parametrize("inputs,escalations,risk_level,action",
+                         [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_escalation_table(inputs, escalations, risk_level, action):
+    result, reasons = _run(**inputs)
+
+    # A consensus below the gate may add its own reason; everything else must match exactly
+    assert [r for r in reasons if not r.startswith("consensus")] == escalations
+    assert result["risk_level"] == risk_level
+    assert result["ai_recommendation"] == action
+    assert [a["name"] for a in result["agents"]] == [
+        "Vision Detection Agent", "Climate Risk Agent", "Satellite Health Agent", "Market Intelligence Agent",
+    ]
+
+
+def test_clear_cases_answer_directly():
+    for inputs in ({}, {"market": MARKET_FALLING}, {"market": MARKET_STABLE}):
+        result, reasons = _run(**inputs)
+        assert reasons == []
+        assert result["consensus_score"] >= ORCHESTRATION_CONFIDENCE_GATE
+        assert result["overall_status"] == "Low Risk"
+
+
+def test_conflicts_lower_consensus():
+    clean, _ = _run()
+    conflicted, _ = _run(satellite=SATELLITE_HIGH)
+    assert conflicted["conflicts"]
+    assert conflicted["consensus_score"] < clean["consensus_score"]
+    assert conflicted["overall_status"] == "Under Review"
+
+
+def test_missing_agents_escalate_together():
+    _, reasons = _run(climate=FAILED, satellite=FAILED, market=None)
+    assert {"climate data unavailable", "satellite data unavailable", "market data unavailable"} <= set(reasons)
+
+
+def test_consensus_gate_boundary():
+    # Stable market: climate 90, satellite 85, market 50 → consensus exactly 75
+    result, _ = _run(market=MARKET_STABLE)
+    score = result["consensus_score"]
+    assert score == 75
+
+    _, at_gate = _run(market=MARKET_STABLE, gate=score)
+    _, above_gate = _run(market=MARKET_STABLE, gate=score + 1)
+    _, below_gate = _run(market=MARKET_STABLE, gate=score - 1)
+
+    assert at_gate == []
+    assert below_gate == []
+    assert above_gate == [f"consensus {score} below gate {score + 1:g}"]
@@ -0,0 +1,58 @@
+"""
+The vectorised vegetation scorer must agree exactly with the scalar one.
+
+Inputs cover every band edge of each factor and a temperature sweep whose
+scores land on .xx5 ties, where np.round and round() can disagree.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agents.satellite_agent import (  # noqa: E402
+    _compute_vegetation_health,
+    _compute_vegetation_health_vec,
+    _daily_health,
+)
+
+SOLAR = [0.0, 1.99, 2.0, 3.99, 4.0, 8.0, 8.01, 10.0, 10.01, 15.0]
+TEMPERATURES = [-5.0, 4.99, 5.0, 14.99, 15.0, 22.5, 30.0, 30.01, 40.0, 40.01, 50.0]
+HUMIDITIES = [0.0, 39.9, 40.0, 59.9, 60.0, 85.0, 85.1, 95.0, 95.1, 100.0]
+PRECIPITATION = [0.0, 0.01, 1.99, 2.0, 15.0, 15.1, 30.0, 30.1, 80.0]
+
+# Quarter-degree steps put the temperature factor on .xx5 values
+TIE_SWEEP = np.round(np.arange(15.0, 30.0001, 0.0625), 4).tolist()
+
+
+def _grid(temperatures):
+    s, t, h, p = np.meshgrid(SOLAR, temperatures, HUMIDITIES, PRECIPITATION, indexing="ij")
+    return s.ravel(), t.ravel(), h.ravel(), p.ravel()
+
+
+@pytest.mark.parametrize("temperatures", [TEMPERATURES, TIE_SWEEP], ids=["band_edges", "tie_sweep"])
+def test_vegetation_health_vec_matches_scalar(temperatures):
+    s, t, h, p = _grid(temperatures)
+
+    vec = _compute_vegetation_health_vec(s, t, h, p)
+    scalar = [
+        _compute_vegetation_health(float(a), float(b), float(c), float(d))
+        for a, b, c, d in zip(s, t, h, p)
+    ]
+
+    assert vec.tolist() == scalar
+
+
+def test_daily_health_scores_complete_days():
+    rows = [
+        ("20240601", 5.0, 24.0, 70.0, 3.0),
+        ("20240602", None, 24.0, 70.0, 3.0),   # unpublished day
+        ("20240603", 9.0, 31.0, 90.0, 0.0),
+    ]
+
+    daily = _daily_health(rows)
+
+    assert [d["date"] for d in daily] == ["2024-06-01", "2024-06-03"]
+    assert [d["ndvi"] for d in daily] == [
+        _compute_vegetation_health(5.0, 24.0, 70.0, 3.0),
+        _compute_vegetation_health(9.0, 31.0, 90.0, 0.0),
+    ]
+    assert _daily_health([]) == []
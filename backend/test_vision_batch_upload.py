@@ -0,0 +1,78 @@
+"""
+Batch upload limits on /api/vision/analyze/batch: oversized uploads and zips
+with too many (or too large) image members are rejected with 413 before
+anything reaches the model.
+
+Importing main loads the vision agent, so this needs torch and transformers.
+"""
+import io
+import zipfile
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    analyzed = []
+
+    async def fake_analyze(images):
+        analyzed.extend(images)
+        for name, _ in images:
+            yield {"filename": name}
+
+    monkeypatch.setattr(main, "analyze_images", fake_analyze)
+    monkeypatch.setattr(main, "VISION_BATCH_MAX_FILES", 3)
+    monkeypatch.setattr(main, "VISION_BATCH_MAX_BYTES", 10_000)
+    monkeypatch.setattr(main, "_UPLOAD_CHUNK", 1024)
+    client = TestClient(main.app)
+    client.analyzed = analyzed
+    return client
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buf.getvalue()
+
+
+def _post(client, files):
+    return client.post("/api/vision/analyze/batch", files=files)
+
+
+def test_within_limits_is_analyzed(client):
+    response = _post(client, [
+        ("files", ("a.jpg", b"x" * 100, "image/jpeg")),
+        ("files", ("b.zip", _zip({"b.png": b"y" * 100, "notes.txt": b"skip"}), "application/zip")),
+    ])
+    assert response.status_code == 200
+    assert [name for name, _ in client.analyzed] == ["a.jpg", "b.png"]
+
+
+def test_oversized_upload_is_413(client):
+    response = _post(client, [("files", ("big.jpg", b"x" * 20_000, "image/jpeg"))])
+    assert response.status_code == 413
+    assert client.analyzed == []
+
+
+def test_zip_member_count_counts_earlier_uploads(client):
+    response = _post(client, [
+        ("files", ("a.jpg", b"x" * 10, "image/jpeg")),
+        ("files", ("b.zip", _zip({f"{i}.png": b"y" for i in range(3)}), "application/zip")),
+    ])
+    assert response.status_code == 413
+    assert client.analyzed == []
+
+
+def test_zip_declared_size_is_413(client):
+    # Compresses far below the cap but expands past it
+    response = _post(client, [("files", ("bomb.zip", _zip({"a.png": b"\0" * 50_000}), "application/zip"))])
+    assert response.status_code == 413
+    assert client.analyzed == []
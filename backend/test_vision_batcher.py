@@ -0,0 +1,112 @@
+"""
+MicroBatcher failure handling: a raising infer_batch fails its batch, a
+crashed scheduler run fails every caller it owed, and a run that exits
+after a restart leaves the new run's callers alone.
+"""
+import asyncio
+import time
+
+from agents.vision_batcher import MicroBatcher
+
+
+def _double(items: list) -> list:
+    return [item * 2 for item in items]
+
+
+def test_batches_results_in_order():
+    batcher = MicroBatcher(_double, max_batch=4, max_wait_ms=5)
+
+    async def main():
+        try:
+            return await batcher.submit_many(list(range(10)))
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(main()) == [i * 2 for i in range(10)]
+    assert batcher.metrics()["items"] == 10
+
+
+def test_worker_exception_reaches_every_pending_caller():
+    def broken(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher(broken, max_batch=8, max_wait_ms=5)
+
+    async def main():
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(i) for i in range(5)), return_exceptions=True), 2,
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) and str(r) == "model exploded" for r in results)
+    assert batcher.metrics()["errors"] >= 1
+    assert batcher.metrics()["loop_crashes"] == 0
+
+
+class _CrashingBatcher(MicroBatcher):
+    """Scheduler run that dies after taking its first batch."""
+
+    async def _collect(self, queue, inflight):
+        batch = await super()._collect(queue, inflight)
+        raise RuntimeError("scheduler bug")
+
+
+def test_loop_crash_fails_pending_callers_instead_of_hanging():
+    batcher = _CrashingBatcher(_double, max_batch=2, max_wait_ms=5)
+
+    async def main():
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(i) for i in range(5)), return_exceptions=True), 2,
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(main())
+    assert len(results) == 5
+    assert all(isinstance(r, RuntimeError) and "scheduler bug" in str(r) for r in results)
+    metrics = batcher.metrics()
+    assert metrics["loop_crashes"] == 1
+    assert "scheduler bug" in metrics["last_crash"]
+
+
+def test_old_run_exit_leaves_restarted_run_alone():
+    batcher = MicroBatcher(_double, max_batch=4, max_wait_ms=1)
+
+    async def main():
+        batcher.start()
+        old_task = batcher._task
+        old_task.cancel()
+        await asyncio.sleep(0)
+        # The old run has finished, but its done-callback has not run yet
+        assert old_task.done()
+
+        batcher.start()
+        future = asyncio.get_running_loop().create_future()
+        batcher._queue.put_nowait((21, future, 0.0))
+        try:
+            return await asyncio.wait_for(future, 2)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(main()) == 42
+
+
+def test_stop_cancels_queued_callers():
+    def slow(items):
+        time.sleep(0.05)
+        return items
+
+    batcher = MicroBatcher(slow, max_batch=1, max_wait_ms=0)
+
+    async def main():
+        tasks = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        await batcher.stop()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
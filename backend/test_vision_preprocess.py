@@ -0,0 +1,115 @@
+"""
+Parity of FastPreprocessor against the HF image processor on generated images.
+
+Lossless inputs must match the HF tensors within LOSSLESS_ATOL. JPEGs large
+enough to trigger draft-mode (DCT-scaled) decoding are not bit-identical, so
+they are held to a mean-difference bound instead; for every image the top-1
+label from the model must be the same on both paths.
+
+Needs torch, transformers and the HF_VISION_MODEL weights (downloaded or
+cached); skipped otherwise.
+"""
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("PIL")
+from PIL import Image, ImageDraw  # noqa: E402
+
+from agents.vision_preprocess import FastPreprocessor  # noqa: E402
+from config import HF_VISION_MODEL  # noqa: E402
+
+LOSSLESS_ATOL = 1e-3      # normalised pixel units
+DRAFT_MEAN_ATOL = 0.05    # mean |diff| for draft-decoded JPEGs
+DRAFT_MAX_ATOL = 1.0      # no single pixel off by more than this
+
+
+def _leaf(width: int, height: int, seed: int = 0) -> Image.Image:
+    """Smooth background + leaf-like ellipse with spots: structured, not noise."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    base = np.stack([60 + 80 * x + 0 * y, 90 + 60 * y + 0 * x, 40 + 40 * x * y], axis=-1)
+    image = Image.fromarray(base.clip(0, 255).astype(np.uint8), "RGB")
+
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((width * 0.15, height * 0.1, width * 0.85, height * 0.9), fill=(50, 140, 45))
+    for _ in range(12):
+        cx, cy = rng.uniform(0.3, 0.7) * width, rng.uniform(0.25, 0.75) * height
+        r = rng.uniform(0.01, 0.04) * min(width, height)
+        draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(120, 90, 30))
+    return image
+
+
+def _encode(image: Image.Image, fmt: str, **kwargs) -> bytes:
+    buf = io.BytesIO()
+    image.save(buf, format=fmt, **kwargs)
+    return buf.getvalue()
+
+
+def _exif_rotated_jpeg() -> bytes:
+    exif = Image.Exif()
+    exif[0x0112] = 6   # Orientation: rotate 90° CW on display
+    return _encode(_leaf(400, 300, seed=3), "JPEG", quality=95, exif=exif.tobytes())
+
+
+CASES = {
+    "rgb_png":        (lambda: _encode(_leaf(300, 300, seed=1), "PNG"), True),
+    "rgba_png":       (lambda: _encode(_leaf(320, 320, seed=2).convert("RGBA"), "PNG"), True),
+    "palette_png":    (lambda: _encode(_leaf(256, 256, seed=4).convert("P"), "PNG"), True),
+    "non_square_png": (lambda: _encode(_leaf(640, 320, seed=5), "PNG"), True),
+    "exif_rotated":   (_exif_rotated_jpeg, False),
+    "large_jpeg":     (lambda: _encode(_leaf(3000, 2000, seed=6), "JPEG", quality=92), False),
+}
+
+
+@pytest.fixture(scope="module")
+def processor():
+    try:
+        return transformers.AutoImageProcessor.from_pretrained(HF_VISION_MODEL)
+    except Exception as e:
+        pytest.skip(f"HF processor unavailable: {e}")
+
+
+@pytest.fixture(scope="module")
+def model():
+    try:
+        return transformers.AutoModelForImageClassification.from_pretrained(HF_VISION_MODEL).eval()
+    except Exception as e:
+        pytest.skip(f"HF model unavailable: {e}")
+
+
+def _reference(processor, image_bytes: bytes) -> np.ndarray:
+    # Same decode as the HF path in vision_agent._preprocess
+    image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    return processor(images=image, return_tensors="np")["pixel_values"][0]
+
+
+def _top1(model, pixels: np.ndarray) -> int:
+    with torch.no_grad():
+        logits = model(pixel_values=torch.from_numpy(pixels[None].astype(np.float32))).logits
+    return int(logits.argmax(-1))
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_fast_preprocess_matches_hf(case, processor, model):
+    make, lossless = CASES[case]
+    image_bytes = make()
+
+    ours = FastPreprocessor(processor)(image_bytes)
+    reference = _reference(processor, image_bytes)
+
+    assert ours.shape == reference.shape
+    assert ours.dtype == np.float32
+
+    diff = np.abs(ours - reference)
+    if lossless:
+        np.testing.assert_allclose(ours, reference, rtol=0, atol=LOSSLESS_ATOL)
+    else:
+        assert float(diff.mean()) <= DRAFT_MEAN_ATOL, f"mean |diff| {diff.mean():.4f}"
+        assert float(diff.max()) <= DRAFT_MAX_ATOL, f"max |diff| {diff.max():.4f}"
+
+    assert _top1(model, ours) == _top1(model, reference)